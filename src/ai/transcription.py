@@ -1,23 +1,44 @@
 import whisper
 import torch
+import librosa
+import soundfile as sf
 import json
 import os
+import re
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from settings import load_settings
+
 
 class AudioTranscriber:
+    # Whisper model shared by every transcriber, keyed by (model name, device, compiled).
+    # Only the last one loaded is kept.
+    _models = {}
+    _models_lock = threading.Lock()
+    
     def __init__(self, config_file="config/settings.json"):
         """Initialize the transcription module with Whisper"""
+        self.config_file = config_file
         self.config = self.load_config(config_file)
         self.model = None
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
         print(f"Using device: {self.device}")
         
+    def reload_config(self):
+        """Re-read the configuration, keeping the loaded model unless it changed"""
+        old_model = self.config["ai"]["whisper_model"]
+        self.config = self.load_config(self.config_file)
+        
+        if self.config["ai"]["whisper_model"] != old_model:
+            self.model = None  # Loaded again (lazily) with the new name
+        
     def load_config(self, config_file):
         """Load configuration"""
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_settings(config_file)
         else:
             return {
                 "ai": {
@@ -29,27 +50,72 @@ class AudioTranscriber:
             }
     
     def load_model(self):
-        """Load Whisper model (lazy loading)"""
+        """Load Whisper model (lazy loading, shared across transcriber instances)"""
         if self.model is None:
             model_name = self.config["ai"]["whisper_model"]
-            print(f"Loading Whisper model: {model_name}...")
-            self.model = whisper.load_model(model_name, device=self.device)
-            print(f"Model loaded successfully!")
+            compile_model = (self.device == "cuda" and hasattr(torch, "compile")
+                             and self.config["ai"].get("compile_model", True))
+            key = (model_name, self.device, compile_model)
+            
+            with AudioTranscriber._models_lock:
+                model = AudioTranscriber._models.get(key)
+                if model is None:
+                    # Drop the previous model first so switching sizes doesn't keep both resident
+                    AudioTranscriber._models.clear()
+                    if self.device == "cuda":
+                        torch.cuda.empty_cache()
+                    
+                    print(f"Loading Whisper model: {model_name}...")
+                    model = whisper.load_model(model_name, device=self.device)
+                    
+                    # The encoder always sees a fixed 30 s mel window, so it compiles
+                    # once into fused kernels. The decoder is left eager: its growing
+                    # token length would keep triggering recompilation.
+                    if compile_model:
+                        model.encoder = torch.compile(model.encoder, mode="reduce-overhead")
+                        print("Whisper encoder compiled with torch.compile")
+                    
+                    AudioTranscriber._models[key] = model
+                    print(f"Model loaded successfully!")
+            
+            self.model = model
         return self.model
     
-    def transcribe_audio(self, audio_file, language=None):
+    def _load_audio(self, audio_file):
+        """Decode audio file to Whisper's input (16 kHz mono float32)"""
+        if not os.path.exists(audio_file):
+            raise FileNotFoundError(f"Audio file not found: {audio_file}")
+        
+        # Decode in-process instead of spawning ffmpeg for every file
+        try:
+            audio, sr = sf.read(audio_file, dtype='float32', always_2d=False)
+        except RuntimeError:
+            # Formats libsndfile can't read (m4a, ...) still go through ffmpeg
+            return whisper.load_audio(audio_file)
+        
+        # Downmix to mono
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        
+        if sr != whisper.audio.SAMPLE_RATE:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=whisper.audio.SAMPLE_RATE)
+        
+        return audio
+    
+    def transcribe_audio(self, audio_file, language=None, audio=None):
         """
         Transcribe audio file to text
         
         Args:
             audio_file: Path to audio file
             language: Language code (fr, en, auto, etc.)
+            audio: Already decoded audio (default: decode audio_file)
             
         Returns:
             Dictionary with transcription results
         """
-        if not os.path.exists(audio_file):
-            raise FileNotFoundError(f"Audio file not found: {audio_file}")
+        if audio is None:
+            audio = self._load_audio(audio_file)
         
         # Load model if not loaded
         model = self.load_model()
@@ -61,11 +127,14 @@ class AudioTranscriber:
         print(f"\nTranscribing: {audio_file}")
         print(f"Language: {language}")
         
+        # Half precision only pays off (and is only supported) on GPU
+        fp16 = self.device == "cuda"
+        
         # Transcribe
         if language == "auto":
-            result = model.transcribe(audio_file, fp16=False)
+            result = model.transcribe(audio, fp16=fp16)
         else:
-            result = model.transcribe(audio_file, language=language, fp16=False)
+            result = model.transcribe(audio, language=language, fp16=fp16)
         
         # Extract information
         transcription = {
@@ -98,7 +167,8 @@ class AudioTranscriber:
             Summary text
         """
         # Simple extraction-based summary (can be improved with GPT/Claude API)
-        sentences = text.split('. ')
+        # Only the first few sentences are used, don't split the whole text
+        sentences = list(islice(self._iter_sentences(text), 10))
         
         if style == "short":
             # First 3 sentences
@@ -119,7 +189,7 @@ class AudioTranscriber:
         elif style == "report":
             # Structured report
             total_words = len(text.split())
-            total_sentences = len(sentences)
+            total_sentences = text.count('. ') + 1
             avg_sentence_length = total_words / max(total_sentences, 1)
             
             report = f"""COMPTE-RENDU:
@@ -138,20 +208,46 @@ Contenu:
         
         return text
     
-    def transcribe_and_save(self, audio_file, output_dir=None):
+    def _iter_sentences(self, text):
+        """Lazily yield the same pieces as text.split('. ')"""
+        start = 0
+        while True:
+            end = text.find('. ', start)
+            if end == -1:
+                yield text[start:]
+                return
+            yield text[start:end]
+            start = end + 2
+    
+    def transcribe_and_save(self, audio_file, output_dir=None, audio=None):
         """
         Transcribe audio and save results to files
         
         Args:
             audio_file: Path to audio file
             output_dir: Directory to save results (default: same as audio)
+            audio: Already decoded audio (default: decode audio_file)
             
         Returns:
             Dictionary with paths to saved files
         """
         # Transcribe
-        transcription = self.transcribe_audio(audio_file)
+        transcription = self.transcribe_audio(audio_file, audio=audio)
         
+        return self._write_outputs(audio_file, transcription, output_dir)
+    
+    def _write_outputs(self, audio_file, transcription, output_dir=None):
+        """
+        Save a transcription to text, timestamped, summary and JSON files
+        
+        Args:
+            audio_file: Path to the transcribed audio file
+            transcription: Dictionary returned by transcribe_audio
+            output_dir: Directory to save results (default: same as audio)
+            
+        Returns:
+            Dictionary with paths to saved files
+        """
         # Determine output directory
         if output_dir is None:
             output_dir = os.path.dirname(audio_file)
@@ -247,14 +343,38 @@ Contenu:
         print(f"\n🎙️ Batch transcription: {total} files")
         print("=" * 80)
         
-        for i, audio_file in enumerate(audio_files, 1):
-            print(f"\n[{i}/{total}] Processing: {os.path.basename(audio_file)}")
+        # Decode the next file in the background while the current one is
+        # being transcribed, and write finished transcriptions on I/O threads,
+        # so the model never waits on decoding or disk writes
+        pending_writes = []
+        
+        with ThreadPoolExecutor(max_workers=1) as prefetch_pool, \
+                ThreadPoolExecutor(max_workers=2) as io_pool:
+            pending = prefetch_pool.submit(self._load_audio, audio_files[0]) if audio_files else None
+            
+            for i, audio_file in enumerate(audio_files, 1):
+                print(f"\n[{i}/{total}] Processing: {os.path.basename(audio_file)}")
+                current, pending = pending, None
+                if i < total:
+                    pending = prefetch_pool.submit(self._load_audio, audio_files[i])
+                
+                try:
+                    audio = current.result()
+                    transcription = self.transcribe_audio(audio_file, audio=audio)
+                    write = io_pool.submit(self._write_outputs, audio_file, transcription)
+                    pending_writes.append((len(results), audio_file, write))
+                    results.append(None)  # Filled in once the files are written
+                except Exception as e:
+                    print(f"❌ Error: {e}")
+                    results.append({"file": audio_file, "success": False, "error": str(e)})
+        
+        # Collect write results (the pools are shut down, all writes are done)
+        for index, audio_file, write in pending_writes:
             try:
-                result = self.transcribe_and_save(audio_file)
-                results.append({"file": audio_file, "success": True, "result": result})
+                results[index] = {"file": audio_file, "success": True, "result": write.result()}
             except Exception as e:
                 print(f"❌ Error: {e}")
-                results.append({"file": audio_file, "success": False, "error": str(e)})
+                results[index] = {"file": audio_file, "success": False, "error": str(e)}
         
         # Summary
         success_count = sum(1 for r in results if r["success"])
@@ -269,16 +389,20 @@ Contenu:
         
         Args:
             transcription: Transcription dictionary
-            keyword: Search term
+            keyword: Search term, or list of search terms
             
         Returns:
             List of matching segments with timestamps
         """
         matches = []
-        keyword_lower = keyword.lower()
+        keywords = [keyword] if isinstance(keyword, str) else keyword
+        
+        # One case-insensitive pattern for all keywords: each segment is
+        # scanned once, without lowercasing a copy of its text
+        pattern = re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
         
         for segment in transcription['segments']:
-            if keyword_lower in segment['text'].lower():
+            if pattern.search(segment['text']):
                 matches.append({
                     "timestamp": f"{self._format_time(segment['start'])} - {self._format_time(segment['end'])}",
                     "text": segment['text'],
@@ -1,9 +1,365 @@
 import numpy as np
 import librosa
 from pydub import AudioSegment
-from pydub.effects import normalize, compress_dynamic_range
-import json
+from numba import njit
+from joblib import Memory
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import scipy.fft
+import subprocess
+import tempfile
 import os
+from settings import load_settings
+
+# FFT backend for librosa: pyFFTW with plan caching if installed, else scipy.fft
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft as _fft_lib
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(60)
+    pyfftw.config.NUM_THREADS = os.cpu_count() or 1
+except ImportError:
+    _fft_lib = scipy.fft
+
+# On-disk cache for analysis results (location overridable like librosa's),
+# under the project directory whatever the working directory
+_memory = Memory(os.environ.get(
+    "AUDIO_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "audio")
+), verbose=0)
+
+
+@contextmanager
+def _multicore_fft():
+    """Run librosa's FFTs on all cores for the duration of the block"""
+    previous = librosa.get_fftlib()
+    librosa.set_fftlib(_fft_lib)
+    try:
+        with scipy.fft.set_workers(os.cpu_count() or 1):
+            yield
+    finally:
+        librosa.set_fftlib(previous)
+
+
+def _fast_load(path, sr=None, mono=True):
+    """
+    Load an audio file as float32, like librosa.load
+    
+    Formats libsndfile reads natively (the recorder writes WAV) skip the
+    audioread/ffmpeg decode path entirely. With mono=False the samples
+    are channels first, as librosa returns them.
+    """
+    if path.lower().endswith(('.wav', '.flac', '.ogg')):
+        import soundfile as sf
+        y, file_sr = sf.read(path, dtype='float32', always_2d=True)
+        y = y.mean(axis=1) if mono or y.shape[1] == 1 else np.ascontiguousarray(y.T)
+        if sr is not None and sr != file_sr:
+            y = librosa.resample(y, orig_sr=file_sr, target_sr=sr)
+            file_sr = sr
+        return y, file_sr
+    return librosa.load(path, sr=sr, mono=mono, dtype=np.float32)
+
+
+def _cuda_stretch_available():
+    """True when torchaudio is installed and a CUDA device is present"""
+    try:
+        import torch
+        import torchaudio  # noqa: F401
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def _time_stretch_torch(y, rate, n_fft=2048, hop_length=512):
+    """
+    Phase-vocoder time stretch on the GPU with torchaudio
+    
+    Same STFT size, hop and output length as librosa.effects.time_stretch.
+    """
+    import torch
+    import torchaudio.transforms as T
+    
+    device = "cuda"
+    spec = T.Spectrogram(n_fft=n_fft, hop_length=hop_length, power=None).to(device)(
+        torch.from_numpy(np.ascontiguousarray(y)).to(device)
+    )
+    stretched = T.TimeStretch(hop_length=hop_length, n_freq=n_fft // 2 + 1, fixed_rate=rate).to(device)(spec)
+    length = int(round(y.shape[-1] / rate))
+    y_out = T.InverseSpectrogram(n_fft=n_fft, hop_length=hop_length).to(device)(stretched, length=length)
+    return y_out.cpu().numpy()
+
+
+def _spectral_subtract(y, sr, n_fft=1024, hop_length=256, floor=0.1):
+    """
+    Spectral subtraction with a per-bin noise estimate
+    
+    The noise magnitude of every frequency bin is averaged over the first
+    0.5 seconds; each bin is then scaled by max(1 - (noise/|X|)^2, floor),
+    keeping the original phase.
+    """
+    S = librosa.stft(y, n_fft=n_fft, hop_length=hop_length)
+    mag = np.abs(S)
+    
+    noise_frames = max(1, int(0.5 * sr / hop_length))
+    noise_mag = mag[:, :noise_frames].mean(axis=1, keepdims=True)
+    
+    gain = np.maximum(1 - (noise_mag / (mag + 1e-9)) ** 2, floor)
+    return librosa.istft(S * gain, hop_length=hop_length, length=len(y))
+
+
+def _nonsilent_bounds(y, sr, silence_threshold, chunk_ms=10):
+    """
+    Sample range left after trimming leading and trailing silence
+    
+    Args:
+        y: Mono or (channels, frames) samples scaled to full scale 1.0
+        sr: Sample rate
+        silence_threshold: Silence threshold in dBFS
+        chunk_ms: Length of the scanned frames in ms
+        
+    Returns:
+        (start, end) sample indices, start == end if everything is silent
+    """
+    n = y.shape[-1]
+    if n == 0:
+        return 0, 0
+    
+    # dBFS of every frame at once over all channels (the last frame may be shorter)
+    channels = 1 if y.ndim == 1 else y.shape[0]
+    energy = y * y if y.ndim == 1 else np.einsum('ij,ij->j', y, y)
+    frame_len = max(1, int(sr * chunk_ms / 1000))
+    starts = np.arange(0, n, frame_len)
+    lengths = np.diff(np.append(starts, n))
+    power = np.add.reduceat(energy, starts) / (lengths * channels)
+    with np.errstate(divide='ignore'):
+        loud = 10 * np.log10(power) >= silence_threshold
+    
+    if not loud.any():
+        return n, n
+    
+    # Both ends from the same frames, the tail through a reversed view
+    first = int(np.argmax(loud))
+    last = len(loud) - 1 - int(np.argmax(loud[::-1]))
+    return int(starts[first]), int(starts[last] + lengths[last])
+
+
+@njit(cache=True)
+def _compress_kernel(y, thresh_rms, ratio, look_frames, attack_frames, release_frames):
+    """
+    Port of pydub's compress_dynamic_range on a (channels, frames) array
+    
+    The RMS over the previous look_frames frames comes from a running sum
+    of the original energy, so every frame costs O(channels), not O(window).
+    """
+    channels, n = y.shape
+    energy = np.zeros(n + 1)
+    for i in range(n):
+        s = 0.0
+        for c in range(channels):
+            s += y[c, i] * y[c, i]
+        energy[i + 1] = energy[i] + s
+    
+    attenuation = 0.0
+    for i in range(n):
+        start = max(0, i - look_frames)
+        count = (i - start) * channels
+        rms_now = 0.0
+        if count > 0:
+            rms_now = np.sqrt(max(energy[i] - energy[start], 0.0) / count)
+        
+        db_over = 0.0
+        if rms_now > 0.0:
+            db_over = max(20.0 * np.log10(rms_now / thresh_rms), 0.0)
+        max_attenuation = (1.0 - 1.0 / ratio) * db_over
+        
+        if rms_now > thresh_rms and attenuation <= max_attenuation:
+            attenuation = min(attenuation + max_attenuation / attack_frames, max_attenuation)
+        else:
+            attenuation = max(attenuation - max_attenuation / release_frames, 0.0)
+        
+        if attenuation != 0.0:
+            gain = 10.0 ** (-attenuation / 20.0)
+            for c in range(channels):
+                y[c, i] *= gain
+
+
+def _normalize_np(y, sr, headroom=0.1):
+    """Scale the peak to -headroom dBFS (numpy port of pydub's normalize)"""
+    peak = np.max(np.abs(y)) if y.size else 0.0
+    if peak == 0:
+        return y
+    return y * np.float32(10 ** (-headroom / 20) / peak)
+
+
+def _denoise_np(y, sr):
+    """Mono spectral subtraction, as remove_noise"""
+    return _spectral_subtract(librosa.to_mono(y), sr)
+
+
+def _trim_np(y, sr, threshold_db=-40):
+    """Trim leading and trailing silence of a (channels, frames) or mono array"""
+    start, end = _nonsilent_bounds(y, sr, threshold_db)
+    return y[..., start:end]
+
+
+def _compress_np(y, sr, threshold=-20.0, ratio=4.0, attack=5.0, release=50.0):
+    """Dynamic range compression with pydub's defaults, on a numpy array"""
+    y = np.array(y, dtype=np.float32)
+    _compress_kernel(
+        y.reshape(1, -1) if y.ndim == 1 else y,
+        10 ** (threshold / 20),
+        ratio,
+        int(attack * sr / 1000),
+        attack * sr / 1000,
+        release * sr / 1000
+    )
+    return y
+
+
+def _write_samples(output_file, y, sr):
+    """Encode a (channels, frames) or mono array once, in the file's format"""
+    ext = os.path.splitext(output_file)[1].lower()
+    
+    if ext in ('.wav', '.flac', '.ogg'):
+        import soundfile as sf
+        sf.write(output_file, y.T, sr)
+        return
+    
+    # Formats libsndfile can't write go through pydub/ffmpeg as 16-bit PCM
+    pcm = (np.clip(y, -1.0, 1.0) * 32767).astype(np.int16)
+    AudioSegment(
+        data=pcm.T.tobytes(),
+        sample_width=2,
+        frame_rate=sr,
+        channels=1 if y.ndim == 1 else y.shape[0]
+    ).export(output_file, format=ext[1:])
+
+
+def _load_pcm16(path):
+    """Decode a file to a (frames, channels) int16 array"""
+    if path.lower().endswith(('.wav', '.flac', '.ogg')):
+        import soundfile as sf
+        return sf.read(path, dtype='int16', always_2d=True)
+    
+    audio = AudioSegment.from_file(path).set_sample_width(2)
+    data = np.frombuffer(audio.raw_data, dtype=np.int16)
+    return data.reshape(-1, audio.channels), audio.frame_rate
+
+
+def _encode_pcm16(output_file, data, sr):
+    """Encode a contiguous (frames, channels) int16 array by piping it to ffmpeg"""
+    subprocess.run(
+        [AudioSegment.converter, '-y', '-loglevel', 'error',
+         '-f', 's16le', '-ar', str(sr), '-ac', str(data.shape[1]), '-i', 'pipe:0',
+         output_file],
+        input=data.data,
+        check=True
+    )
+
+
+def _same_stream_format(input_files, output_file):
+    """
+    True when every input has the same container, codec, sample rate and
+    channel count as the others and as the output extension, so the
+    streams can be concatenated without re-encoding
+    """
+    import soundfile as sf
+    
+    ext = os.path.splitext(output_file)[1].lower()
+    if any(os.path.splitext(f)[1].lower() != ext for f in input_files):
+        return False
+    
+    try:
+        infos = [sf.info(f) for f in input_files]
+    except RuntimeError:  # Not readable by libsndfile
+        return False
+    
+    first = infos[0]
+    return all(
+        (i.format, i.subtype, i.samplerate, i.channels) ==
+        (first.format, first.subtype, first.samplerate, first.channels)
+        for i in infos
+    )
+
+
+def _concat_copy(input_files, output_file):
+    """Concatenate files with ffmpeg's concat demuxer (stream copy, no decode)"""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as playlist:
+        for f in input_files:
+            escaped = os.path.abspath(f).replace("'", "'\\''")
+            playlist.write(f"file '{escaped}'\n")
+    
+    try:
+        subprocess.run(
+            [AudioSegment.converter, '-y', '-loglevel', 'error',
+             '-f', 'concat', '-safe', '0', '-i', playlist.name, '-c', 'copy', output_file],
+            check=True
+        )
+    finally:
+        os.remove(playlist.name)
+
+
+# Operation name -> (in-memory stage, output suffix) used by batch_process
+_PIPELINE = {
+    'normalize': (_normalize_np, '_normalized'),
+    'denoise': (_denoise_np, '_cleaned'),
+    'trim': (_trim_np, '_trimmed'),
+    'compress': (_compress_np, '_compressed')
+}
+
+
+@_memory.cache
+def _measure_quality(input_file, mtime):
+    """
+    Compute the quality metrics of an audio file
+    mtime is part of the cache key so a rewritten file is analyzed again
+    """
+    # Load (libsndfile fast path for WAV/FLAC/OGG)
+    y, sr = _fast_load(input_file)
+    
+    # Calculate metrics
+    
+    # One magnitude spectrogram (librosa's default framing) shared by RMS and centroid
+    S = np.abs(librosa.stft(y, n_fft=2048, hop_length=512))
+    abs_y = np.abs(y)
+    
+    # 1. RMS (loudness)
+    rms = librosa.feature.rms(S=S, frame_length=2048, hop_length=512)[0]
+    avg_rms = np.mean(rms)
+    
+    # 2. Zero crossing rate (noisiness)
+    zcr = librosa.feature.zero_crossing_rate(y)[0]
+    avg_zcr = np.mean(zcr)
+    
+    # 3. Spectral centroid (brightness)
+    spectral_centroid = librosa.feature.spectral_centroid(S=S, sr=sr)[0]
+    avg_centroid = np.mean(spectral_centroid)
+    
+    # 4. Dynamic range, from the extremes only (same result as
+    #    amplitude_to_db(ref=np.max) with its amplitude amin=1e-5 and top_db=80)
+    signal_peak = np.max(abs_y)
+    dynamic_range = min(20 * np.log10(max(signal_peak, 1e-5) / max(np.min(abs_y), 1e-5)), 80.0)
+    
+    # 5. Signal-to-noise ratio estimate
+    #    10th percentile (linear interpolation) via O(N) partition, no full sort
+    k = 0.1 * (abs_y.size - 1)
+    lo = int(k)
+    hi = min(lo + 1, abs_y.size - 1)
+    part = np.partition(abs_y, [lo, hi])
+    noise_floor = part[lo] + (part[hi] - part[lo]) * (k - lo)
+    snr = 20 * np.log10(signal_peak / noise_floor) if noise_floor > 0 else 0
+    
+    return {
+        "sample_rate": sr,
+        "duration_sec": len(y) / sr,
+        "avg_loudness_rms": float(avg_rms),
+        "avg_zero_crossing_rate": float(avg_zcr),
+        "avg_spectral_centroid": float(avg_centroid),
+        "dynamic_range_db": float(dynamic_range),
+        "estimated_snr_db": float(snr)
+    }
+
 
 class AudioProcessor:
     def __init__(self, config_file="config/settings.json"):
@@ -13,8 +369,7 @@ class AudioProcessor:
     def load_config(self, config_file):
         """Load configuration"""
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_settings(config_file)
         return {}
     
     def normalize_audio(self, input_file, output_file=None):
@@ -34,14 +389,14 @@ class AudioProcessor:
         
         print(f"🔊 Normalizing: {input_file}")
         
-        # Load audio
-        audio = AudioSegment.from_file(input_file)
+        # Load audio (channels first, float32)
+        y, sr = _fast_load(input_file, mono=False)
         
         # Normalize (bring to standard volume)
-        normalized_audio = normalize(audio)
+        normalized = _normalize_np(y, sr)
         
         # Export
-        normalized_audio.export(output_file, format=output_file.split('.')[-1])
+        _write_samples(output_file, normalized, sr)
         
         print(f"✅ Normalized audio saved: {output_file}")
         return output_file
@@ -63,21 +418,15 @@ class AudioProcessor:
         
         print(f"🧹 Removing noise: {input_file}")
         
-        # Load audio with librosa
-        y, sr = librosa.load(input_file, sr=None)
+        # Load audio (libsndfile fast path for WAV/FLAC/OGG)
+        y, sr = _fast_load(input_file)
         
-        # Estimate noise (first 0.5 seconds assumed to be noise)
-        noise_sample = y[:int(0.5 * sr)]
-        
-        # Calculate noise threshold
-        noise_threshold = np.mean(np.abs(noise_sample)) * 1.5
-        
-        # Simple noise gate
-        y_cleaned = np.where(np.abs(y) > noise_threshold, y, 0)
+        # Spectral subtraction (first 0.5 seconds assumed to be noise)
+        y_clean = _spectral_subtract(y, sr)
         
         # Save
         import soundfile as sf
-        sf.write(output_file, y_cleaned, sr)
+        sf.write(output_file, y_clean, sr)
         
         print(f"✅ Noise-reduced audio saved: {output_file}")
         return output_file
@@ -100,27 +449,17 @@ class AudioProcessor:
         
         print(f"✂️ Trimming silence: {input_file}")
         
-        # Load audio
-        audio = AudioSegment.from_file(input_file)
-        
-        # Find non-silent parts
-        def detect_leading_silence(sound, silence_threshold=-50.0, chunk_size=10):
-            trim_ms = 0
-            while sound[trim_ms:trim_ms+chunk_size].dBFS < silence_threshold and trim_ms < len(sound):
-                trim_ms += chunk_size
-            return trim_ms
+        # Load audio (channels first, float32)
+        y, sr = _fast_load(input_file, mono=False)
         
-        start_trim = detect_leading_silence(audio, threshold_db)
-        end_trim = detect_leading_silence(audio.reverse(), threshold_db)
+        # Find non-silent parts, 10 ms frames scanned in one vectorized pass
+        start, end = _nonsilent_bounds(y, sr, threshold_db)
         
-        duration = len(audio)
-        trimmed = audio[start_trim:duration-end_trim]
-        
-        # Export
-        trimmed.export(output_file, format=output_file.split('.')[-1])
+        # Export (a view of the loaded samples, no copy)
+        _write_samples(output_file, y[..., start:end], sr)
         
         print(f"✅ Trimmed audio saved: {output_file}")
-        print(f"   Removed: {start_trim/1000:.2f}s from start, {end_trim/1000:.2f}s from end")
+        print(f"   Removed: {start/sr:.2f}s from start, {(y.shape[-1] - end)/sr:.2f}s from end")
         return output_file
     
     def apply_compression(self, input_file, output_file=None):
@@ -140,19 +479,19 @@ class AudioProcessor:
         
         print(f"🎚️ Applying compression: {input_file}")
         
-        # Load audio
-        audio = AudioSegment.from_file(input_file)
+        # Load audio (channels first, float32)
+        y, sr = _fast_load(input_file, mono=False)
         
         # Apply compression
-        compressed = compress_dynamic_range(audio)
+        compressed = _compress_np(y, sr)
         
         # Export
-        compressed.export(output_file, format=output_file.split('.')[-1])
+        _write_samples(output_file, compressed, sr)
         
         print(f"✅ Compressed audio saved: {output_file}")
         return output_file
     
-    def change_speed(self, input_file, output_file=None, speed=1.0):
+    def change_speed(self, input_file, output_file=None, speed=1.0, backend="auto"):
         """
         Change audio speed (pitch preserved)
         
@@ -160,6 +499,7 @@ class AudioProcessor:
             input_file: Path to input audio file
             output_file: Path to output file
             speed: Speed multiplier (1.0 = normal, 1.5 = 50% faster, 0.75 = 25% slower)
+            backend: 'librosa', 'torchaudio' (GPU) or 'auto' (torchaudio when CUDA is available)
             
         Returns:
             Path to speed-changed file
@@ -170,11 +510,20 @@ class AudioProcessor:
         
         print(f"⚡ Changing speed: {input_file} (x{speed})")
         
-        # Load with librosa
-        y, sr = librosa.load(input_file, sr=None)
+        # Load (libsndfile fast path for WAV/FLAC/OGG)
+        y, sr = _fast_load(input_file)
+        
+        if backend == "auto":
+            backend = "torchaudio" if _cuda_stretch_available() else "librosa"
         
         # Time stretch (preserves pitch)
-        y_stretched = librosa.effects.time_stretch(y, rate=speed)
+        if backend == "torchaudio":
+            y_stretched = _time_stretch_torch(y, speed)
+        elif backend == "librosa":
+            with _multicore_fft():
+                y_stretched = librosa.effects.time_stretch(y, rate=speed)
+        else:
+            raise ValueError(f"Unknown time stretch backend: {backend}")
         
         # Save
         import soundfile as sf
@@ -224,19 +573,29 @@ class AudioProcessor:
         """
         print(f"🔗 Merging {len(input_files)} files...")
         
-        # Load first file
-        merged = AudioSegment.from_file(input_files[0])
+        if crossfade_ms == 0 and _same_stream_format(input_files, output_file):
+            # Identical formats: let ffmpeg copy the streams back to back
+            _concat_copy(input_files, output_file)
         
-        # Append other files
-        for file in input_files[1:]:
-            next_audio = AudioSegment.from_file(file)
-            if crossfade_ms > 0:
-                merged = merged.append(next_audio, crossfade=crossfade_ms)
-            else:
-                merged = merged + next_audio
-        
-        # Export
-        merged.export(output_file, format=output_file.split('.')[-1])
+        elif crossfade_ms > 0:
+            # Load first file
+            merged = AudioSegment.from_file(input_files[0])
+            
+            # Append other files
+            for file in input_files[1:]:
+                merged = merged.append(AudioSegment.from_file(file), crossfade=crossfade_ms)
+            
+            # Export
+            merged.export(output_file, format=output_file.split('.')[-1])
+        
+        else:
+            # Bring every file to common parameters, then join the raw data once
+            # (repeated + would copy the growing result for every file)
+            parts = AudioSegment._sync(*[AudioSegment.from_file(f) for f in input_files])
+            merged = parts[0]._spawn(b''.join(part.raw_data for part in parts))
+            
+            # Export
+            merged.export(output_file, format=output_file.split('.')[-1])
         
         print(f"✅ Merged audio saved: {output_file}")
         return output_file
@@ -257,25 +616,22 @@ class AudioProcessor:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        # Load audio
-        audio = AudioSegment.from_file(input_file)
+        # Decode once, segments are row slices (views) of this array
+        data, sr = _load_pcm16(input_file)
         
         # Calculate number of segments
-        total_duration_ms = len(audio)
-        segment_duration_ms = segment_duration_sec * 1000
-        num_segments = int(np.ceil(total_duration_ms / segment_duration_ms))
+        total_frames = len(data)
+        segment_frames = int(segment_duration_sec * sr)
+        num_segments = int(np.ceil(total_frames / segment_frames))
         
         segments = []
         base_name = os.path.splitext(os.path.basename(input_file))[0]
         
         for i in range(num_segments):
-            start_ms = i * segment_duration_ms
-            end_ms = min((i + 1) * segment_duration_ms, total_duration_ms)
-            
-            segment = audio[start_ms:end_ms]
+            segment = data[i * segment_frames:(i + 1) * segment_frames]
             
             output_file = os.path.join(output_dir, f"{base_name}_part{i+1:03d}.mp3")
-            segment.export(output_file, format="mp3")
+            _encode_pcm16(output_file, segment, sr)
             
             segments.append(output_file)
             print(f"   ✅ Segment {i+1}/{num_segments}: {output_file}")
@@ -295,42 +651,18 @@ class AudioProcessor:
         """
         print(f"📊 Analyzing audio quality: {input_file}")
         
-        # Load with librosa
-        y, sr = librosa.load(input_file, sr=None)
-        
-        # Calculate metrics
-        
-        # 1. RMS (loudness)
-        rms = librosa.feature.rms(y=y)[0]
-        avg_rms = np.mean(rms)
-        
-        # 2. Zero crossing rate (noisiness)
-        zcr = librosa.feature.zero_crossing_rate(y)[0]
-        avg_zcr = np.mean(zcr)
-        
-        # 3. Spectral centroid (brightness)
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        avg_centroid = np.mean(spectral_centroid)
-        
-        # 4. Dynamic range
-        db = librosa.amplitude_to_db(np.abs(y), ref=np.max)
-        dynamic_range = np.max(db) - np.min(db)
-        
-        # 5. Signal-to-noise ratio estimate
-        noise_floor = np.percentile(np.abs(y), 10)
-        signal_peak = np.max(np.abs(y))
-        snr = 20 * np.log10(signal_peak / noise_floor) if noise_floor > 0 else 0
+        # Metrics are cached on disk, unchanged files are not decoded again
+        with _multicore_fft():
+            metrics = _measure_quality(input_file, os.path.getmtime(input_file))
         
         quality = {
             "file": input_file,
-            "sample_rate": sr,
-            "duration_sec": len(y) / sr,
-            "avg_loudness_rms": float(avg_rms),
-            "avg_zero_crossing_rate": float(avg_zcr),
-            "avg_spectral_centroid": float(avg_centroid),
-            "dynamic_range_db": float(dynamic_range),
-            "estimated_snr_db": float(snr),
-            "quality_score": self._calculate_quality_score(avg_rms, dynamic_range, snr)
+            **metrics,
+            "quality_score": self._calculate_quality_score(
+                metrics["avg_loudness_rms"],
+                metrics["dynamic_range_db"],
+                metrics["estimated_snr_db"]
+            )
         }
         
         # Display report
@@ -356,40 +688,79 @@ class AudioProcessor:
         
         return quality
     
-    def batch_process(self, input_files, operations):
+    def _process_one(self, input_file, operations, incremental=True):
+        """
+        Apply the operations to one file, in order
+        
+        The file is decoded once, the stages run on the samples in memory,
+        and only the final result is encoded.
+        
+        Args:
+            input_file: Path to input audio file
+            operations: List of operations to apply
+            incremental: Reuse the output if it is already newer than the input
+            
+        Returns:
+            Path to the processed file (input_file if nothing was applied)
+        """
+        print(f"\n⚙️ Processing: {os.path.basename(input_file)}")
+        
+        stages = [_PIPELINE[op] for op in operations if op in _PIPELINE]
+        if not stages:
+            return input_file
+        
+        base, ext = os.path.splitext(input_file)
+        output_file = base + ''.join(suffix for _, suffix in stages) + ext
+        
+        # Up-to-date output from a previous run: nothing to recompute
+        if (incremental and os.path.exists(output_file)
+                and os.path.getmtime(output_file) >= os.path.getmtime(input_file)):
+            print(f"⏭️ Up to date: {output_file}")
+            return output_file
+        
+        # Load once, channels first
+        y, sr = _fast_load(input_file, mono=False)
+        
+        for stage, _ in stages:
+            y = stage(y, sr)
+        
+        # Encode once
+        _write_samples(output_file, y, sr)
+        
+        print(f"✅ Processed audio saved: {output_file}")
+        return output_file
+    
+    def batch_process(self, input_files, operations, max_workers=None, incremental=True):
         """
         Batch process multiple files with specified operations
         
+        Files are independent, so they are processed in parallel worker
+        processes (pydub and librosa hold the GIL for much of their work).
+        
         Args:
             input_files: List of input file paths
             operations: List of operations to apply ['normalize', 'denoise', 'trim', 'compress']
+            max_workers: Number of worker processes (default: CPU count)
+            incremental: Skip files whose output is already newer than the input
             
         Returns:
-            List of processed file paths
+            List of processed file paths, in input order
         """
         print(f"\n🔄 BATCH PROCESSING: {len(input_files)} files")
         print(f"   Operations: {', '.join(operations)}")
         
-        processed_files = []
-        
-        for i, input_file in enumerate(input_files, 1):
-            print(f"\n[{i}/{len(input_files)}] Processing: {os.path.basename(input_file)}")
-            
-            current_file = input_file
-            
-            for operation in operations:
-                base, ext = os.path.splitext(current_file)
-                
-                if operation == 'normalize':
-                    current_file = self.normalize_audio(current_file)
-                elif operation == 'denoise':
-                    current_file = self.remove_noise(current_file)
-                elif operation == 'trim':
-                    current_file = self.trim_silence(current_file)
-                elif operation == 'compress':
-                    current_file = self.apply_compression(current_file)
-            
-            processed_files.append(current_file)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(input_files)))
+        
+        if max_workers == 1:
+            processed_files = [self._process_one(f, operations, incremental) for f in input_files]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                processed_files = list(executor.map(
+                    partial(self._process_one, operations=operations, incremental=incremental),
+                    input_files
+                ))
         
         print(f"\n✅ Batch processing complete: {len(processed_files)} files processed")
         return processed_files
@@ -1,35 +1,78 @@
 import pyaudio
+import numpy as np
 import wave
 import threading
 import time
 import os
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 from pydub import AudioSegment
-import json
+import re
+from settings import load_settings
+
+# Naming pattern variables and the strftime code each one expands to
+_PATTERN_VARS = {
+    "jour": "%d",
+    "mois": "%m",
+    "annee": "%Y",
+    "heure": "%H",
+    "minutes": "%M",
+    "secondes": "%S"
+}
+_PATTERN_RE = re.compile(r"%(" + "|".join(_PATTERN_VARS) + r")%")
+
+# Seconds of audio the capture ring buffer holds while the writer catches up
+RING_SECONDS = 10
+
 
 class AudioRecorder:
+    # Input devices found by PortAudio, shared by all recorders (None: not enumerated yet)
+    _devices = None
+    
     def __init__(self, config_file="config/settings.json"):
         """Initialize the audio recorder with configuration"""
-        self.config = self.load_config(config_file)
+        self.config_file = config_file
         self.is_recording = False
-        self.frames = []
+        self._wf = None  # WAV file the current segment is streamed to
+        
+        # Ring buffer filled by the PortAudio callback, drained by _record.
+        # Positions only grow (single producer / single consumer, no lock).
+        self._ring = None
+        self._write_pos = 0
+        self._read_pos = 0
         self.audio = None
         self.stream = None
         self.recording_thread = None
         self.current_file = None
         self.start_time = None
         
-        # Audio parameters from config
+        # Format conversion runs off the recording thread
+        self._conv_pool = ThreadPoolExecutor(max_workers=2)
+        self._conversions = []
+        
+        # Audio parameters
         self.chunk = 1024
         self.format = pyaudio.paInt16
         self.channels = 2  # Stereo
+        
+        self.reload_config()
+        
+    def reload_config(self):
+        """Re-read the configuration (takes effect at the next recording)"""
+        self.config = self.load_config(self.config_file)
+        
+        # Audio parameters from config
         self.rate = int(self.config["audio"]["sample_rate"])
         
+        # Naming parameters, read once instead of on every rollover
+        self.naming_pattern = self.config["storage"]["naming_pattern"]
+        self.extension = self.config["audio"]["format"]
+        self.storage_path = self.config["storage"]["path"]
+        
     def load_config(self, config_file):
         """Load configuration from JSON file"""
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_settings(config_file)
         else:
             # Default configuration
             return {
@@ -49,25 +92,18 @@ class AudioRecorder:
     def generate_filename(self):
         """Generate filename based on the naming pattern"""
         now = datetime.now()
-        pattern = self.config["storage"]["naming_pattern"]
+        pattern = self.naming_pattern
         
-        # Replace variables
-        filename = pattern.replace("%jour%", now.strftime("%d"))
-        filename = filename.replace("%mois%", now.strftime("%m"))
-        filename = filename.replace("%annee%", now.strftime("%Y"))
-        filename = filename.replace("%heure%", now.strftime("%H"))
-        filename = filename.replace("%minutes%", now.strftime("%M"))
-        filename = filename.replace("%secondes%", now.strftime("%S"))
+        # Replace variables (one pass over the pattern)
+        filename = _PATTERN_RE.sub(lambda m: now.strftime(_PATTERN_VARS[m.group(1)]), pattern)
         
         # Add extension
-        extension = self.config["audio"]["format"]
-        filename = f"{filename}.{extension}"
+        filename = f"{filename}.{self.extension}"
         
         # Create full path
-        storage_path = self.config["storage"]["path"]
-        os.makedirs(storage_path, exist_ok=True)
+        os.makedirs(self.storage_path, exist_ok=True)
         
-        return os.path.join(storage_path, filename)
+        return os.path.join(self.storage_path, filename)
     
     def start_recording(self):
         """Start audio recording"""
@@ -79,20 +115,25 @@ class AudioRecorder:
             # Initialize PyAudio
             self.audio = pyaudio.PyAudio()
             
-            # Open stream
+            self._ring = np.empty(self.rate * self.channels * RING_SECONDS, dtype=np.int16)
+            self._write_pos = 0
+            self._read_pos = 0
+            
+            self.is_recording = True
+            self.start_time = time.time()
+            self.current_file = self.generate_filename()
+            self._open_segment()
+            
+            # Open stream (callback mode, PortAudio pushes the samples)
             self.stream = self.audio.open(
                 format=self.format,
                 channels=self.channels,
                 rate=self.rate,
                 input=True,
-                frames_per_buffer=self.chunk
+                frames_per_buffer=self.chunk,
+                stream_callback=self._callback
             )
             
-            self.is_recording = True
-            self.frames = []
-            self.start_time = time.time()
-            self.current_file = self.generate_filename()
-            
             # Start recording in a separate thread
             self.recording_thread = threading.Thread(target=self._record)
             self.recording_thread.start()
@@ -104,14 +145,50 @@ class AudioRecorder:
             print(f"Error starting recording: {e}")
             return False
     
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PortAudio input callback: copy the chunk into the ring buffer"""
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        size = len(self._ring)
+        start = self._write_pos % size
+        end = start + len(samples)
+        
+        if end <= size:
+            self._ring[start:end] = samples
+        else:
+            split = size - start
+            self._ring[start:] = samples[:split]
+            self._ring[:end - size] = samples[split:]
+        
+        self._write_pos += len(samples)
+        return (None, pyaudio.paContinue)
+    
+    def _drain(self):
+        """Write everything captured since the last drain to the segment file"""
+        size = len(self._ring)
+        write_pos = self._write_pos
+        pending = write_pos - self._read_pos
+        
+        if pending > size:
+            print(f"⚠️ Capture buffer overrun, {pending - size} samples dropped")
+            self._read_pos = write_pos - size
+            pending = size
+        
+        start = self._read_pos % size
+        first = min(pending, size - start)
+        self._wf.writeframes(self._ring[start:start + first])
+        if pending > first:
+            self._wf.writeframes(self._ring[:pending - first])
+        
+        self._read_pos = write_pos
+    
     def _record(self):
-        """Internal recording loop (runs in separate thread)"""
+        """Internal writer loop (runs in separate thread)"""
         max_duration = self.config["audio"]["max_duration"] * 60  # Convert to seconds
         
         while self.is_recording:
             try:
-                data = self.stream.read(self.chunk, exception_on_overflow=False)
-                self.frames.append(data)
+                time.sleep(self.chunk / self.rate)
+                self._drain()  # Straight to disk, memory stays bounded by the ring
                 
                 # Check if max duration reached
                 elapsed_time = time.time() - self.start_time
@@ -121,9 +198,9 @@ class AudioRecorder:
                     
                     # Start new recording if still recording
                     if self.is_recording:
-                        self.frames = []
                         self.start_time = time.time()
                         self.current_file = self.generate_filename()
+                        self._open_segment()
                         print(f"New file started: {self.current_file}")
                 
             except Exception as e:
@@ -138,53 +215,84 @@ class AudioRecorder:
         
         self.is_recording = False
         
+        # Stop capture first so no callback runs after the last drain
+        if self.stream:
+            self.stream.stop_stream()
+        
         # Wait for recording thread to finish
         if self.recording_thread:
             self.recording_thread.join()
         
+        # Write what the stream captured after the thread's last pass
+        if self._wf is not None:
+            self._drain()
+        
         # Save the recording
         saved_file = self._save_current_recording()
         
         # Cleanup
         if self.stream:
-            self.stream.stop_stream()
             self.stream.close()
         
         if self.audio:
             self.audio.terminate()
         
+        # Make sure every segment is on disk in its final format
+        self.flush()
+        
         print(f"Recording stopped and saved: {saved_file}")
         return saved_file
     
+    def _temp_wav_path(self):
+        """Path of the WAV file the current segment is written to"""
+        return self.current_file.replace(f".{self.extension}", "_temp.wav")
+    
+    def _open_segment(self):
+        """Open the temporary WAV file for the current segment"""
+        self._wf = wave.open(self._temp_wav_path(), 'wb')
+        self._wf.setnchannels(self.channels)
+        self._wf.setsampwidth(pyaudio.get_sample_size(self.format))
+        self._wf.setframerate(self.rate)
+    
     def _save_current_recording(self):
-        """Save current frames to file"""
-        if not self.frames:
-            print("No frames to save!")
+        """Finalize the current segment file"""
+        if self._wf is None:
             return None
         
-        temp_wav = self.current_file.replace(
-            f".{self.config['audio']['format']}", 
-            "_temp.wav"
-        )
+        # Close the streamed WAV (writes the final header sizes)
+        nframes = self._wf.getnframes()
+        self._wf.close()
+        self._wf = None
         
-        # Save as WAV first
-        wf = wave.open(temp_wav, 'wb')
-        wf.setnchannels(self.channels)
-        wf.setsampwidth(self.audio.get_sample_size(self.format))
-        wf.setframerate(self.rate)
-        wf.writeframes(b''.join(self.frames))
-        wf.close()
+        temp_wav = self._temp_wav_path()
+        
+        if nframes == 0:
+            print("No frames to save!")
+            os.remove(temp_wav)
+            return None
         
-        # Convert to desired format if not WAV
+        # Convert to desired format if not WAV (in the background)
         output_format = self.config["audio"]["format"]
         if output_format != "wav":
-            self._convert_audio(temp_wav, self.current_file, output_format)
-            os.remove(temp_wav)  # Remove temporary WAV
+            self._conversions = [f for f in self._conversions if not f.done()]
+            self._conversions.append(self._conv_pool.submit(
+                self._convert_and_cleanup, temp_wav, self.current_file, output_format
+            ))
         else:
             os.rename(temp_wav, self.current_file)
         
         return self.current_file
     
+    def _convert_and_cleanup(self, temp_wav, output_file, output_format):
+        """Convert a finished segment, then remove its temporary WAV"""
+        self._convert_audio(temp_wav, output_file, output_format)
+        os.remove(temp_wav)  # Remove temporary WAV
+    
+    def flush(self):
+        """Wait for pending format conversions to finish"""
+        wait(self._conversions)
+        self._conversions = []
+    
     def _convert_audio(self, input_file, output_file, output_format):
         """Convert audio to desired format"""
         try:
@@ -222,8 +330,20 @@ class AudioRecorder:
             "format": self.config["audio"]["format"]
         }
     
+    @property
+    def devices_dirty(self):
+        """True when the device list must be enumerated again"""
+        return AudioRecorder._devices is None
+    
+    def refresh_devices(self):
+        """Forget the cached device list (e.g. after plugging a new device)"""
+        AudioRecorder._devices = None
+    
     def list_audio_devices(self):
-        """List all available audio input devices"""
+        """List all available audio input devices (enumerated once, then cached)"""
+        if AudioRecorder._devices is not None:
+            return AudioRecorder._devices
+        
         audio = pyaudio.PyAudio()
         devices = []
         
@@ -238,6 +358,7 @@ class AudioRecorder:
                 })
         
         audio.terminate()
+        AudioRecorder._devices = devices
         return devices
 
 
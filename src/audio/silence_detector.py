@@ -1,24 +1,327 @@
 import numpy as np
-import librosa
+from numpy.lib.stride_tricks import sliding_window_view
 from pydub import AudioSegment
-from pydub.silence import detect_silence, detect_nonsilent
-import json
+from numba import njit
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import math
+from functools import cached_property, lru_cache
 import os
+import sys
+import threading
+from settings import load_settings
+
+try:
+    import soundfile as sf
+except ImportError as e:
+    raise ImportError("silence_detector requires the 'soundfile' package (pip install soundfile)") from e
+
+
+def _frame_rms(y, frame_length=2048, hop_length=512):
+    """
+    Frame-wise RMS, same framing as librosa.feature.rms (centered, zero padded)
+    
+    Frames are strided views of the signal, so nothing is copied per frame.
+    """
+    padded = np.pad(y, frame_length // 2)
+    frames = sliding_window_view(padded, frame_length)[::hop_length]
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame_length)
+
+
+def _amplitude_to_db(amplitude, amin=1e-5, top_db=80.0):
+    """librosa.amplitude_to_db(amplitude, ref=np.max) without the extra passes"""
+    peak = max(float(amplitude.max()), amin)
+    db = 20.0 * np.log10(np.maximum(amplitude, amin) / peak)
+    return np.maximum(db, db.max() - top_db)
+
+
+# Labels for the codes returned by _classify_core
+_SILENCE_TYPES = ("natural", "abnormal")
+
+
+@njit(cache=True, fastmath=True)
+def _classify_core(y, sr, duration):
+    """
+    Numeric body of classify_silence_type on the context window y
+    
+    Returns: 0 (natural) or 1 (abnormal)
+    """
+    n = y.shape[0]
+    
+    # 1. Gradual fade (natural) or sudden cut (abnormal): RMS of the first
+    #    and last 0.25s, both in one loop without temporaries
+    if n > sr * 0.5:
+        w = int(sr * 0.25)
+        s = 0.0
+        e = 0.0
+        for i in range(w):
+            s += y[i] * y[i]
+            e += y[n - w + i] * y[n - w + i]
+        start_rms = math.sqrt(s / w)
+        end_rms = math.sqrt(e / w)
+        
+        if start_rms > 0.001 and end_rms > 0.001:
+            if min(start_rms, end_rms) / max(start_rms, end_rms) > 0.3:
+                return 0
+    
+    # 2. Only long silences (> 5s) are abnormal in broadcast
+    if duration > 5.0:
+        return 1
+    return 0
+
+
+def _energy_limit(silence_thresh):
+    """Per-sample int16 energy at silence_thresh dBFS (full scale is 32768)"""
+    return 10 ** (silence_thresh / 10) * 32768 ** 2
+
+
+def _detect_silence_np(samples, channels, sr, min_silence_len, silence_thresh, seek_step=1):
+    """
+    pydub.silence.detect_silence on a sample array, without the per-ms loop
+    
+    Every min_silence_len window (one per seek_step ms, plus the last one,
+    as pydub scans) gets its mean power from an integer prefix sum of the
+    frame energies.
+    
+    Args:
+        samples: Interleaved int16 samples
+        channels: Number of interleaved channels
+        sr: Sample rate
+        min_silence_len: Minimum silence length in ms
+        silence_thresh: Silence threshold in dBFS
+        seek_step: Step between window starts in ms
+        
+    Returns: List of [start_ms, end_ms] silent ranges
+    """
+    frames = samples.reshape(-1, channels)
+    n = len(frames)
+    seg_len = int(round(1000 * n / sr))
+    min_silence_len = int(min_silence_len)
+    if seg_len < min_silence_len:
+        return []
+    
+    # Energy prefix sum at every millisecond boundary (int64, exact)
+    energy = np.concatenate(([0], np.cumsum(np.einsum('ij,ij->i', frames, frames, dtype=np.int64))))
+    bounds = np.minimum(np.arange(seg_len + 1) * sr // 1000, n)
+    ms_energy = energy[bounds]
+    
+    # Mean power of the window starting at every seek_step
+    last_start = seg_len - min_silence_len
+    starts = np.arange(0, last_start + 1, seek_step)
+    if last_start % seek_step:
+        starts = np.append(starts, last_start)
+    ends = starts + min_silence_len
+    counts = np.maximum((bounds[ends] - bounds[starts]) * channels, 1)
+    silent = starts[ms_energy[ends] - ms_energy[starts] <= _energy_limit(silence_thresh) * counts]
+    if len(silent) == 0:
+        return []
+    
+    # Silent starts more than one window apart begin a new range (pydub's merge rule)
+    breaks = np.flatnonzero(np.diff(silent) > min_silence_len)
+    range_starts = silent[np.concatenate(([0], breaks + 1))]
+    range_ends = silent[np.concatenate((breaks, [len(silent) - 1]))] + min_silence_len
+    return [[int(a), int(b)] for a, b in zip(range_starts, range_ends)]
+
+
+def _stream_silences(path, min_silence_len, silence_thresh, seek_step=1, block_ms=1000):
+    """
+    Yield the same [start_ms, end_ms] ranges as _detect_silence_np while
+    reading the file block by block (memory O(block + min_silence_len))
+    
+    Args:
+        path: Audio file readable by libsndfile
+        min_silence_len: Minimum silence length in ms
+        silence_thresh: Silence threshold in dBFS
+        seek_step: Step between window starts in ms
+        block_ms: Length of the blocks read from disk, in ms
+    """
+    min_silence_len = int(min_silence_len)
+    limit = _energy_limit(silence_thresh)
+    
+    with sf.SoundFile(path) as f:
+        sr, channels, n = f.samplerate, f.channels, f.frames
+        seg_len = int(round(1000 * n / sr))
+        if seg_len < min_silence_len:
+            return
+        
+        # Cumulative energy at the last min_silence_len ms boundaries, carried across blocks
+        carry = np.zeros(1, dtype=np.int64)
+        carry_first = 0  # ms boundary of carry[0]
+        range_start = prev = None
+        
+        for k0 in range(0, seg_len, block_ms):
+            k1 = min(k0 + block_ms, seg_len)
+            bounds = np.minimum(np.arange(k0, k1 + 1) * sr // 1000, n)
+            block = f.read(bounds[-1] - bounds[0], dtype='int16', always_2d=True)
+            
+            energy = carry[-1] + np.concatenate(
+                ([0], np.cumsum(np.einsum('ij,ij->i', block, block, dtype=np.int64)))
+            )
+            cum = np.concatenate((carry, energy[bounds[1:] - bounds[0]]))
+            
+            # Windows that end inside this block
+            starts = np.arange(max(0, k0 + 1 - min_silence_len), k1 - min_silence_len + 1)
+            starts = starts[(starts % seek_step == 0) | (starts == seg_len - min_silence_len)]
+            if len(starts):
+                ends = starts + min_silence_len
+                counts = (np.minimum(ends * sr // 1000, n) - np.minimum(starts * sr // 1000, n)) * channels
+                energy_sum = cum[ends - carry_first] - cum[starts - carry_first]
+                silent = starts[energy_sum <= limit * np.maximum(counts, 1)]
+                
+                if len(silent):
+                    if prev is None:
+                        range_start = prev = int(silent[0])
+                    # Emit every range closed by a gap (pydub's merge rule)
+                    chain = np.concatenate(([prev], silent))
+                    for b in np.flatnonzero(np.diff(chain) > min_silence_len):
+                        yield [range_start, int(chain[b]) + min_silence_len]
+                        range_start = int(chain[b + 1])
+                    prev = int(chain[-1])
+            
+            new_first = max(0, k1 - min_silence_len)
+            carry = cum[new_first - carry_first:]
+            carry_first = new_first
+        
+        if prev is not None:
+            yield [range_start, prev + min_silence_len]
+
+
+def _detect_nonsilent_np(silent_ranges, seg_len):
+    """Complement of the silent ranges over [0, seg_len], as pydub.silence.detect_nonsilent"""
+    if not silent_ranges:
+        return [[0, seg_len]]
+    if silent_ranges[0] == [0, seg_len]:
+        return []
+    
+    nonsilent_ranges = []
+    prev_end = 0
+    for start, end in silent_ranges:
+        nonsilent_ranges.append([prev_end, start])
+        prev_end = end
+    if prev_end != seg_len:
+        nonsilent_ranges.append([prev_end, seg_len])
+    
+    if nonsilent_ranges[0] == [0, 0]:
+        nonsilent_ranges.pop(0)
+    return nonsilent_ranges
+
+
+@lru_cache(maxsize=16)
+def _scan_silences(path, mtime_ns, min_silence_len, silence_thresh, seek_step=1):
+    """
+    Silent and non-silent [start_ms, end_ms] ranges of a file, scanned once
+    per (path, mtime, parameters)
+    
+    Files libsndfile can read are streamed block by block; other formats
+    are decoded once (cached) and scanned in memory.
+    """
+    try:
+        info = sf.info(path)
+    except RuntimeError:
+        samples, channels, sr, seg_len = _load_audio(path).samples
+        silent_ranges = _detect_silence_np(samples, channels, sr, min_silence_len, silence_thresh, seek_step)
+    else:
+        silent_ranges = list(_stream_silences(path, min_silence_len, silence_thresh, seek_step))
+        seg_len = int(round(1000 * info.frames / info.samplerate))
+    
+    return silent_ranges, _detect_nonsilent_np(silent_ranges, seg_len)
+
+
+@dataclass
+class _DecodedAudio:
+    """Decoded forms of one audio file, each decoded on first use"""
+    path: str
+    
+    @cached_property
+    def segment(self):
+        """pydub AudioSegment of the file"""
+        return AudioSegment.from_file(self.path)
+    
+    @cached_property
+    def samples(self):
+        """(interleaved int16 samples, channels, sr, length in ms)"""
+        try:
+            y, sr = sf.read(self.path, dtype='int16', always_2d=True)
+            return y.ravel(), y.shape[1], sr, int(round(1000 * len(y) / sr))
+        except RuntimeError:
+            audio = self.segment.set_sample_width(2)
+            samples = np.frombuffer(audio.raw_data, dtype=np.int16)
+            return samples, audio.channels, audio.frame_rate, len(audio)
+    
+    @cached_property
+    def wave(self):
+        """(y, sr) mono float32 waveform at the native sample rate"""
+        try:
+            # libsndfile reads WAV/FLAC/OGG directly (no audioread, no resampling)
+            y, sr = sf.read(self.path, dtype='float32')
+        except RuntimeError:
+            # Other formats: downmix the pydub decode
+            samples, channels, sr, _ = self.samples
+            y = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+            return y / np.float32(32768), sr
+        if y.ndim == 2:
+            y = y.mean(axis=1)
+        return y, sr
+
+
+# Decoded file of the current thread, so batch_report's threads don't evict each other's
+_decoded = threading.local()
+
+
+def _load(path, mtime_ns):
+    """
+    Shared decode per (path, mtime), so a rewritten file is decoded again
+    Only the file being processed by this thread is kept (see SilenceDetector.release_audio)
+    """
+    key = (path, mtime_ns)
+    if getattr(_decoded, "key", None) != key:
+        _decoded.key, _decoded.audio = key, _DecodedAudio(path)
+    return _decoded.audio
+
+
+def _load_audio(path):
+    """Decoded audio for path, reused across the detector's passes"""
+    return _load(path, os.stat(path).st_mtime_ns)
+
+
+# Formats libsndfile streams without holding the GIL for the decode,
+# so batches made only of these can run on threads
+_THREADED_EXTENSIONS = (".wav", ".flac", ".ogg")
+
+
+def _report_worker(audio_file, config_file):
+    """Report for one file, from a detector built inside the worker"""
+    try:
+        return SilenceDetector(config_file).generate_silence_report(audio_file)
+    finally:
+        SilenceDetector.release_audio()
+
 
 class SilenceDetector:
     def __init__(self, config_file="config/settings.json"):
         """Initialize silence detector with configuration"""
-        self.config = self.load_config(config_file)
+        self.config_file = config_file
+        self.reload_config()
+        
+    def reload_config(self):
+        """Re-read the configuration and the parameters derived from it"""
+        self.config = self.load_config(self.config_file)
         
         # Parameters from config
         self.silence_threshold = self.config["audio"]["silence_threshold"]  # in dB
         self.min_silence_duration = self.config["audio"]["min_silence_duration"] * 1000  # Convert to ms
         
+        # Linear amplitude ratio of the threshold (levels are relative to the peak).
+        # dB levels are clipped at -80 (top_db), so a lower threshold never matches.
+        self._amp_threshold = 10.0 ** (self.silence_threshold / 20.0) if self.silence_threshold > -80.0 else 0.0
+        
+        # Scan resolution: 1% of the minimum silence (30ms steps for 3s)
+        self.seek_step = max(1, int(self.min_silence_duration) // 100)
+        
     def load_config(self, config_file):
         """Load configuration from JSON file"""
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_settings(config_file)
         else:
             return {
                 "audio": {
@@ -28,21 +331,29 @@ class SilenceDetector:
                 }
             }
     
+    @staticmethod
+    def release_audio():
+        """Drop the decoded audio this thread kept between passes once a file is done"""
+        _decoded.key = _decoded.audio = None
+    
+    def _silence_and_nonsilence(self, audio_file):
+        """Silent and non-silent ranges in ms, from a single (cached) scan"""
+        return _scan_silences(
+            audio_file,
+            os.stat(audio_file).st_mtime_ns,
+            self.min_silence_duration,
+            self.silence_threshold,
+            self.seek_step
+        )
+    
     def detect_silence_segments(self, audio_file):
         """
         Detect silence segments in an audio file
         Returns: List of tuples (start_ms, end_ms) for each silence segment
         """
         try:
-            # Load audio file
-            audio = AudioSegment.from_file(audio_file)
-            
             # Detect silence
-            silence_segments = detect_silence(
-                audio,
-                min_silence_len=self.min_silence_duration,
-                silence_thresh=self.silence_threshold
-            )
+            silence_segments, _ = self._silence_and_nonsilence(audio_file)
             
             # Convert to seconds for readability
             silence_segments_sec = [
@@ -62,13 +373,8 @@ class SilenceDetector:
         Returns: List of tuples (start_ms, end_ms) for each audio segment
         """
         try:
-            audio = AudioSegment.from_file(audio_file)
-            
-            nonsilent_segments = detect_nonsilent(
-                audio,
-                min_silence_len=self.min_silence_duration,
-                silence_thresh=self.silence_threshold
-            )
+            # Complement of the silence scan, no second decode or scan
+            _, nonsilent_segments = self._silence_and_nonsilence(audio_file)
             
             # Convert to seconds
             nonsilent_segments_sec = [
@@ -88,14 +394,14 @@ class SilenceDetector:
         Returns: Dictionary with analysis results
         """
         try:
-            # Load audio with librosa
-            y, sr = librosa.load(audio_file, sr=None)
+            # Load audio (decoded once per file)
+            y, sr = _load_audio(audio_file).wave
             
             # Calculate RMS energy
-            rms = librosa.feature.rms(y=y)[0]
+            rms = _frame_rms(y)
             
             # Convert to dB
-            db = librosa.amplitude_to_db(rms, ref=np.max)
+            db = _amplitude_to_db(rms)
             
             # Statistics
             analysis = {
@@ -105,7 +411,7 @@ class SilenceDetector:
                 "max_level_db": float(np.max(db)),
                 "min_level_db": float(np.min(db)),
                 "std_level_db": float(np.std(db)),
-                "silence_ratio": self._calculate_silence_ratio(db)
+                "silence_ratio": self._calculate_silence_ratio(rms)
             }
             
             return analysis
@@ -114,10 +420,12 @@ class SilenceDetector:
             print(f"Error analyzing audio levels: {e}")
             return None
     
-    def _calculate_silence_ratio(self, db_levels):
-        """Calculate the ratio of silence in the audio"""
-        silence_frames = np.sum(db_levels < self.silence_threshold)
-        total_frames = len(db_levels)
+    def _calculate_silence_ratio(self, rms_levels):
+        """Calculate the ratio of silence in the audio (compared in amplitude, no log10)"""
+        # Same floor as _amplitude_to_db (amin=1e-5) on both the levels and the peak
+        peak = max(float(rms_levels.max(initial=0.0)), 1e-5)
+        silence_frames = np.count_nonzero(np.maximum(rms_levels, 1e-5) < self._amp_threshold * peak)
+        total_frames = len(rms_levels)
         
         if total_frames == 0:
             return 0.0
@@ -137,128 +445,186 @@ class SilenceDetector:
             start_sec, end_sec = silence_segment
             duration = end_sec - start_sec
             
-            # Load audio
-            y, sr = librosa.load(audio_file, sr=None, 
-                                offset=max(0, start_sec - 1),  # 1s before silence
-                                duration=duration + 2)  # +1s before and after
-            
-            # Analyze the context around the silence
-            
-            # 1. Check if there's a gradual fade (natural) or sudden cut (abnormal)
-            if len(y) > sr * 0.5:  # At least 0.5s of audio
-                # Check first and last 0.25s
-                window_size = int(sr * 0.25)
-                
-                start_segment = y[:window_size]
-                end_segment = y[-window_size:]
-                
-                # Calculate RMS for fade detection
-                start_rms = np.sqrt(np.mean(start_segment**2))
-                end_rms = np.sqrt(np.mean(end_segment**2))
-                
-                # If there's a gradual fade, it's likely natural
-                if start_rms > 0.001 and end_rms > 0.001:
-                    fade_ratio = min(start_rms, end_rms) / max(start_rms, end_rms)
-                    
-                    if fade_ratio > 0.3:  # Gradual transition
-                        return "natural"
-            
-            # 2. Check silence duration
-            # Very short silences (< 1s) in music are usually natural
-            # Very long silences (> 5s) are usually abnormal in broadcast
-            if duration < 1.0:
-                return "natural"
-            elif duration > 5.0:
-                return "abnormal"
-            
-            # 3. Check frequency content before/after silence
-            # Natural pauses usually have similar frequency content
-            # Abnormal cuts might have different content
+            try:
+                # Seek straight to the context (1s before the silence, +1s after)
+                with sf.SoundFile(audio_file) as f:
+                    sr = f.samplerate
+                    f.seek(int(max(0, start_sec - 1) * sr))
+                    y = f.read(int((duration + 2) * sr), dtype='float32', always_2d=True).mean(axis=1)
+            except RuntimeError:
+                # Not seekable by libsndfile (MP3...): slice the cached decode
+                full_y, sr = _load_audio(audio_file).wave
+                offset = int(max(0, start_sec - 1) * sr)  # 1s before silence
+                y = full_y[offset:offset + int((duration + 2) * sr)]  # +1s before and after
             
-            # Default to natural if uncertain
-            return "natural"
+            # Analyze the context around the silence (compiled kernel):
+            # fade in/out around the silence, then its duration
+            return _SILENCE_TYPES[_classify_core(y, sr, duration)]
             
         except Exception as e:
             print(f"Error classifying silence: {e}")
             return "unknown"
     
+    def _classify_all(self, y, sr, silence_segments):
+        """
+        Classify every silence at once, same rules as classify_silence_type
+        
+        Args:
+            y: Full mono waveform
+            sr: Sample rate
+            silence_segments: List of (start_sec, end_sec)
+            
+        Returns: List of "natural" / "abnormal", one per segment
+        """
+        seg = np.asarray(silence_segments, dtype=np.float64).reshape(-1, 2)
+        duration = seg[:, 1] - seg[:, 0]
+        
+        # Context windows: 1s before the silence to 1s after it
+        ctx_start = np.minimum((np.maximum(0, seg[:, 0] - 1) * sr).astype(np.int64), len(y))
+        ctx_end = np.minimum(ctx_start + ((duration + 2) * sr).astype(np.int64), len(y))
+        has_context = (ctx_end - ctx_start) > sr * 0.5
+        
+        # RMS of the first and last 0.25s of each context from one prefix sum
+        window_size = int(sr * 0.25)
+        energy = np.concatenate(([0.0], np.cumsum(np.square(y, dtype=np.float64))))
+        head_end = np.minimum(ctx_start + window_size, len(y))
+        tail_start = np.maximum(ctx_end - window_size, 0)
+        start_rms = np.sqrt((energy[head_end] - energy[ctx_start]) / window_size)
+        end_rms = np.sqrt((energy[ctx_end] - energy[tail_start]) / window_size)
+        
+        # Gradual fade on both sides: likely natural (min/max > 0.3, without the divide)
+        valid = has_context & (start_rms > 0.001) & (end_rms > 0.001)
+        fade = valid & (np.minimum(start_rms, end_rms) > 0.3 * np.maximum(start_rms, end_rms))
+        
+        # Otherwise only long silences are abnormal
+        return np.select([fade, duration > 5.0], ["natural", "abnormal"], default="natural").tolist()
+    
     def detect_and_classify_all_silences(self, audio_file):
         """
         Detect all silences and classify them
         Returns: List of dictionaries with silence info
         """
         silence_segments = self.detect_silence_segments(audio_file)
+        if not silence_segments:
+            return []
         
-        results = []
-        for segment in silence_segments:
-            start, end = segment
-            duration = end - start
-            
-            classification = self.classify_silence_type(audio_file, segment)
-            
-            results.append({
+        # All segments classified in one vectorized pass over the waveform
+        try:
+            y, sr = _load_audio(audio_file).wave
+            classifications = self._classify_all(y, sr, silence_segments)
+        except Exception as e:
+            print(f"Error classifying silence: {e}")
+            classifications = ["unknown"] * len(silence_segments)
+        
+        return [
+            {
                 "start_time": start,
                 "end_time": end,
-                "duration": duration,
+                "duration": end - start,
                 "type": classification,
                 "alert_needed": classification == "abnormal"
-            })
-        
-        return results
+            }
+            for (start, end), classification in zip(silence_segments, classifications)
+        ]
     
     def generate_silence_report(self, audio_file):
         """
         Generate a comprehensive silence report
         """
-        print(f"\n=== Silence Analysis Report ===")
-        print(f"File: {audio_file}")
+        lines = ["", "=== Silence Analysis Report ===", f"File: {audio_file}"]
         
         # Audio analysis
         analysis = self.analyze_audio_levels(audio_file)
         if analysis:
-            print(f"\nAudio Statistics:")
-            print(f"  Duration: {analysis['duration_seconds']:.2f}s")
-            print(f"  Average Level: {analysis['avg_level_db']:.2f} dB")
-            print(f"  Max Level: {analysis['max_level_db']:.2f} dB")
-            print(f"  Min Level: {analysis['min_level_db']:.2f} dB")
-            print(f"  Silence Ratio: {analysis['silence_ratio']*100:.1f}%")
+            lines.append(
+                f"\nAudio Statistics:\n"
+                f"  Duration: {analysis['duration_seconds']:.2f}s\n"
+                f"  Average Level: {analysis['avg_level_db']:.2f} dB\n"
+                f"  Max Level: {analysis['max_level_db']:.2f} dB\n"
+                f"  Min Level: {analysis['min_level_db']:.2f} dB\n"
+                f"  Silence Ratio: {analysis['silence_ratio']*100:.1f}%"
+            )
         
         # Silence detection
         silences = self.detect_and_classify_all_silences(audio_file)
         
         if silences:
-            print(f"\nDetected Silences: {len(silences)}")
+            # Count both types in one pass
+            abnormal_count = natural_count = 0
+            for silence in silences:
+                if silence['type'] == 'abnormal':
+                    abnormal_count += 1
+                elif silence['type'] == 'natural':
+                    natural_count += 1
             
-            abnormal_count = sum(1 for s in silences if s['type'] == 'abnormal')
-            natural_count = sum(1 for s in silences if s['type'] == 'natural')
-            
-            print(f"  Natural: {natural_count}")
-            print(f"  Abnormal: {abnormal_count} ⚠️")
+            lines.append(f"\nDetected Silences: {len(silences)}")
+            lines.append(f"  Natural: {natural_count}")
+            lines.append(f"  Abnormal: {abnormal_count} ⚠️")
             
             if abnormal_count > 0:
-                print(f"\n⚠️ ALERT: {abnormal_count} abnormal silence(s) detected!")
+                lines.append(f"\n⚠️ ALERT: {abnormal_count} abnormal silence(s) detected!")
             
-            print("\nDetailed Silence List:")
-            for i, silence in enumerate(silences, 1):
-                alert_marker = "⚠️" if silence['alert_needed'] else "✓"
-                print(f"  {alert_marker} Silence #{i}:")
-                print(f"     Time: {silence['start_time']:.2f}s - {silence['end_time']:.2f}s")
-                print(f"     Duration: {silence['duration']:.2f}s")
-                print(f"     Type: {silence['type']}")
+            # Detailed list, one f-string per silence
+            lines.append("\nDetailed Silence List:")
+            lines.extend(
+                f"  {'⚠️' if silence['alert_needed'] else '✓'} Silence #{i}:\n"
+                f"     Time: {silence['start_time']:.2f}s - {silence['end_time']:.2f}s\n"
+                f"     Duration: {silence['duration']:.2f}s\n"
+                f"     Type: {silence['type']}"
+                for i, silence in enumerate(silences, 1)
+            )
         else:
-            print("\nNo significant silences detected.")
+            abnormal_count = 0
+            lines.append("\nNo significant silences detected.")
+        
+        # Whole report written at once
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return {
             "audio_analysis": analysis,
             "silences": silences,
-            "abnormal_count": sum(1 for s in silences if s['type'] == 'abnormal')
+            "abnormal_count": abnormal_count
         }
+    
+    @classmethod
+    def batch_report(cls, files, workers=None, config_file="config/settings.json"):
+        """
+        Generate silence reports for many files in parallel
+        
+        Each worker builds its own detector. Batches of WAV/FLAC/OGG files
+        run on threads, anything needing a pydub decode runs in processes.
+        
+        Args:
+            files: List of audio file paths
+            workers: Number of workers (default: CPU count)
+            config_file: Configuration file for the detectors
+            
+        Returns: Dictionary {file: report}, in input order
+        """
+        if not files:
+            return {}
+        
+        workers = max(1, min(workers or os.cpu_count() or 1, len(files)))
+        threaded = all(f.lower().endswith(_THREADED_EXTENSIONS) for f in files)
+        executor_class = ThreadPoolExecutor if threaded else ProcessPoolExecutor
+        
+        reports = {}
+        with executor_class(max_workers=workers) as executor:
+            futures = {executor.submit(_report_worker, f, config_file): f for f in files}
+            for done, future in enumerate(as_completed(futures), 1):
+                audio_file = futures[future]
+                try:
+                    reports[audio_file] = future.result()
+                except Exception as e:
+                    print(f"Error analyzing {audio_file}: {e}")
+                    reports[audio_file] = None
+                print(f"[{done}/{len(files)}] {audio_file}")
+        
+        return {f: reports[f] for f in files}
 
 
 # Test function
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python silence_detector.py <audio_file>")
         sys.exit(1)
@@ -5,6 +5,51 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGroupBox,
 from PyQt5.QtCore import Qt
 import json
 import os
+from settings import load_settings
+
+
+# (section, clé, widget, getter, setter) de chaque champ, par onglet
+_SCHEMA = {
+    0: [
+        ("audio", "format", "combo_format", "currentText", "setCurrentText"),
+        ("audio", "quality", "combo_quality", "currentText", "setCurrentText"),
+        ("audio", "sample_rate", "combo_sample_rate", "currentText", "setCurrentText"),
+        ("audio", "max_duration", "spin_max_duration", "value", "setValue"),
+        ("audio", "smart_split", "check_smart_split", "isChecked", "setChecked"),
+        ("audio", "silence_detection", "check_silence_detection", "isChecked", "setChecked"),
+        ("audio", "silence_threshold", "spin_silence_threshold", "value", "setValue"),
+        ("audio", "min_silence_duration", "spin_min_silence", "value", "setValue")
+    ],
+    1: [
+        ("storage", "path", "line_storage_path", "text", "setText"),
+        ("storage", "naming_pattern", "line_naming_pattern", "text", "setText"),
+        ("storage", "auto_delete", "check_auto_delete", "isChecked", "setChecked"),
+        ("storage", "lifetime_days", "spin_lifetime_days", "value", "setValue")
+    ],
+    2: [
+        ("ai", "transcription", "check_transcription", "isChecked", "setChecked"),
+        ("ai", "whisper_model", "combo_whisper_model", "currentText", "setCurrentText"),
+        ("ai", "language", "combo_language", "currentText", "setCurrentText"),
+        ("ai", "ai_summary", "check_ai_summary", "isChecked", "setChecked"),
+        ("ai", "summary_format", "combo_summary_format", "currentText", "setCurrentText"),
+        ("ai", "blank_classification", "check_blank_classification", "isChecked", "setChecked")
+    ],
+    3: [
+        ("email", "enabled", "check_email_alerts", "isChecked", "setChecked"),
+        ("email", "smtp_server", "line_smtp_server", "text", "setText"),
+        ("email", "smtp_port", "spin_smtp_port", "value", "setValue"),
+        ("email", "sender_email", "line_sender_email", "text", "setText"),
+        ("email", "password", "line_email_password", "text", "setText"),
+        ("email", "recipients", "line_recipients", "text", "setText"),
+        ("email", "alert_blank", "check_alert_blank", "isChecked", "setChecked"),
+        ("email", "alert_error", "check_alert_error", "isChecked", "setChecked"),
+        ("email", "alert_storage", "check_alert_storage", "isChecked", "setChecked")
+    ]
+}
+
+# Setters Qt qui n'acceptent que du texte (ex: sample_rate peut être un int)
+_TEXT_SETTERS = {"setCurrentText", "setText"}
+
 
 class ConfigDialog(QDialog):
     def __init__(self, parent=None):
@@ -12,7 +57,6 @@ class ConfigDialog(QDialog):
         self.config_file = "config/settings.json"
         self.config = self.load_config()
         self.init_ui()
-        self.load_values()
         
     def init_ui(self):
         self.setWindowTitle("Configuration du Module")
@@ -20,26 +64,24 @@ class ConfigDialog(QDialog):
         
         layout = QVBoxLayout()
         
-        # Tabs pour organiser les paramètres
-        tabs = QTabWidget()
-        
-        # Tab 1: Audio Settings
-        tab_audio = self.create_audio_tab()
-        tabs.addTab(tab_audio, "Audio")
-        
-        # Tab 2: Storage Settings
-        tab_storage = self.create_storage_tab()
-        tabs.addTab(tab_storage, "Stockage")
+        # Tabs pour organiser les paramètres, construits à la première visite
+        self.tabs = QTabWidget()
+        self._tab_factories = {
+            0: (self.create_audio_tab, "Audio"),
+            1: (self.create_storage_tab, "Stockage"),
+            2: (self.create_ai_tab, "Intelligence Artificielle"),
+            3: (self.create_email_tab, "Alertes Email")
+        }
+        self._tab_built = set()
+        self._fields = []  # (section, clé, getter, setter) des onglets construits
         
-        # Tab 3: AI Settings
-        tab_ai = self.create_ai_tab()
-        tabs.addTab(tab_ai, "Intelligence Artificielle")
+        for index in sorted(self._tab_factories):
+            self.tabs.addTab(QWidget(), self._tab_factories[index][1])
         
-        # Tab 4: Email Alerts
-        tab_email = self.create_email_tab()
-        tabs.addTab(tab_email, "Alertes Email")
+        self.tabs.currentChanged.connect(self._ensure_tab_built)
+        self._ensure_tab_built(self.tabs.currentIndex())
         
-        layout.addWidget(tabs)
+        layout.addWidget(self.tabs)
         
         # Boutons de validation
         button_layout = QHBoxLayout()
@@ -60,6 +102,33 @@ class ConfigDialog(QDialog):
         
         self.setLayout(layout)
     
+    def _ensure_tab_built(self, index):
+        """Remplace le placeholder d'un onglet par son contenu réel"""
+        if index in self._tab_built or index not in self._tab_factories:
+            return
+        
+        factory, title = self._tab_factories[index]
+        self._tab_built.add(index)
+        
+        placeholder = self.tabs.widget(index)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, factory(), title)
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        placeholder.deleteLater()
+        
+        # Méthodes liées résolues une seule fois par champ
+        fields = []
+        for section, key, name, getter, setter in _SCHEMA[index]:
+            widget = getattr(self, name)
+            set_value = getattr(widget, setter)
+            if setter in _TEXT_SETTERS:
+                set_value = lambda value, set_text=set_value: set_text(str(value))
+            fields.append((section, key, getattr(widget, getter), set_value))
+        self._fields.extend(fields)
+        self._load_fields(fields)
+    
     def create_audio_tab(self):
         widget = QWidget()
         layout = QVBoxLayout()
@@ -378,95 +447,34 @@ class ConfigDialog(QDialog):
         
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_settings(self.config_file)
             except:
                 return default_config
         return default_config
     
     def load_values(self):
-        """Charge les valeurs depuis la config dans l'interface"""
-        # Audio
-        self.combo_format.setCurrentText(self.config["audio"]["format"])
-        self.combo_quality.setCurrentText(self.config["audio"]["quality"])
-        self.combo_sample_rate.setCurrentText(str(self.config["audio"]["sample_rate"]))
-        self.spin_max_duration.setValue(self.config["audio"]["max_duration"])
-        self.check_smart_split.setChecked(self.config["audio"]["smart_split"])
-        self.check_silence_detection.setChecked(self.config["audio"]["silence_detection"])
-        self.spin_silence_threshold.setValue(self.config["audio"]["silence_threshold"])
-        self.spin_min_silence.setValue(self.config["audio"]["min_silence_duration"])
-        
-        # Storage
-        self.line_storage_path.setText(self.config["storage"]["path"])
-        self.line_naming_pattern.setText(self.config["storage"]["naming_pattern"])
-        self.check_auto_delete.setChecked(self.config["storage"]["auto_delete"])
-        self.spin_lifetime_days.setValue(self.config["storage"]["lifetime_days"])
-        
-        # AI
-        self.check_transcription.setChecked(self.config["ai"]["transcription"])
-        self.combo_whisper_model.setCurrentText(self.config["ai"]["whisper_model"])
-        self.combo_language.setCurrentText(self.config["ai"]["language"])
-        self.check_ai_summary.setChecked(self.config["ai"]["ai_summary"])
-        self.combo_summary_format.setCurrentText(self.config["ai"]["summary_format"])
-        self.check_blank_classification.setChecked(self.config["ai"]["blank_classification"])
-        
-        # Email
-        self.check_email_alerts.setChecked(self.config["email"]["enabled"])
-        self.line_smtp_server.setText(self.config["email"]["smtp_server"])
-        self.spin_smtp_port.setValue(self.config["email"]["smtp_port"])
-        self.line_sender_email.setText(self.config["email"]["sender_email"])
-        self.line_email_password.setText(self.config["email"]["password"])
-        self.line_recipients.setText(self.config["email"]["recipients"])
-        self.check_alert_blank.setChecked(self.config["email"]["alert_blank"])
-        self.check_alert_error.setChecked(self.config["email"]["alert_error"])
-        self.check_alert_storage.setChecked(self.config["email"]["alert_storage"])
+        """Charge les valeurs depuis la config dans les onglets déjà construits"""
+        self._load_fields(self._fields)
+    
+    def _load_fields(self, fields):
+        for section, key, _, setter in fields:
+            setter(self.config[section][key])
     
     def save_config(self):
         """Sauvegarde la configuration"""
-        self.config = {
-            "audio": {
-                "format": self.combo_format.currentText(),
-                "quality": self.combo_quality.currentText(),
-                "sample_rate": self.combo_sample_rate.currentText(),
-                "max_duration": self.spin_max_duration.value(),
-                "smart_split": self.check_smart_split.isChecked(),
-                "silence_detection": self.check_silence_detection.isChecked(),
-                "silence_threshold": self.spin_silence_threshold.value(),
-                "min_silence_duration": self.spin_min_silence.value()
-            },
-            "storage": {
-                "path": self.line_storage_path.text(),
-                "naming_pattern": self.line_naming_pattern.text(),
-                "auto_delete": self.check_auto_delete.isChecked(),
-                "lifetime_days": self.spin_lifetime_days.value()
-            },
-            "ai": {
-                "transcription": self.check_transcription.isChecked(),
-                "whisper_model": self.combo_whisper_model.currentText(),
-                "language": self.combo_language.currentText(),
-                "ai_summary": self.check_ai_summary.isChecked(),
-                "summary_format": self.combo_summary_format.currentText(),
-                "blank_classification": self.check_blank_classification.isChecked()
-            },
-            "email": {
-                "enabled": self.check_email_alerts.isChecked(),
-                "smtp_server": self.line_smtp_server.text(),
-                "smtp_port": self.spin_smtp_port.value(),
-                "sender_email": self.line_sender_email.text(),
-                "password": self.line_email_password.text(),
-                "recipients": self.line_recipients.text(),
-                "alert_blank": self.check_alert_blank.isChecked(),
-                "alert_error": self.check_alert_error.isChecked(),
-                "alert_storage": self.check_alert_storage.isChecked()
-            }
-        }
+        # Les onglets jamais ouverts gardent les valeurs déjà chargées
+        for section, key, getter, _ in self._fields:
+            self.config.setdefault(section, {})[key] = getter()
         
         # Créer le dossier config s'il n'existe pas
         os.makedirs("config", exist_ok=True)
         
-        # Sauvegarder
-        with open(self.config_file, 'w', encoding='utf-8') as f:
+        # Sauvegarder (indenté, le fichier est édité à la main) dans un
+        # fichier voisin, puis remplacement atomique
+        tmp_file = self.config_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(self.config, indent=4, fp=f)
+        os.replace(tmp_file, self.config_file)
         
         QMessageBox.information(self, "Succès", "Configuration sauvegardée avec succès!")
         self.accept()
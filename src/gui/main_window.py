@@ -1,8 +1,8 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLabel, QStatusBar, QTextEdit,
+                             QPushButton, QLabel, QStatusBar, QPlainTextEdit,
                              QProgressBar, QGroupBox, QMessageBox)
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont
+from PyQt5.QtGui import QFont, QTextCursor
 from gui.config_dialog import ConfigDialog
 from audio.recorder import AudioRecorder
 from audio.silence_detector import SilenceDetector
@@ -10,6 +10,13 @@ from ai.transcription import AudioTranscriber
 from notifications.email_sender import EmailSender
 import os
 
+# Abnormal blanks sent per alert email
+ALERT_BATCH_SIZE = 10
+
+# Seconds the window waits on close for queued alert emails
+EMAIL_FLUSH_TIMEOUT = 5
+
+
 class ProcessingThread(QThread):
     """Thread for post-processing (silence detection, transcription)"""
     update_signal = pyqtSignal(str)
@@ -25,43 +32,59 @@ class ProcessingThread(QThread):
     def run(self):
         results = {}
         
+        # Bound once for the stages below
+        emit = self.update_signal.emit
+        audio_file = self.audio_file
+        
+        # Log lines are sent to the GUI thread in one signal per stage
+        pending = []
+        
         try:
             # 1. Detect silences
-            self.update_signal.emit("🔍 Détection des silences...")
-            silences = self.silence_detector.detect_and_classify_all_silences(self.audio_file)
+            emit("🔍 Détection des silences...")
+            silences = self.silence_detector.detect_and_classify_all_silences(audio_file)
+            
+            abnormal = [
+                {
+                    "file": audio_file,
+                    "start_time": silence['start_time'],
+                    "end_time": silence['end_time'],
+                    "duration": silence['duration']
+                }
+                for silence in silences if silence['type'] == 'abnormal'
+            ]
+            abnormal_count = len(abnormal)
+            
+            # One alert email per ALERT_BATCH_SIZE abnormal blanks
+            for i in range(0, abnormal_count, ALERT_BATCH_SIZE):
+                self.email_sender.send_blank_alert_batch(abnormal[i:i + ALERT_BATCH_SIZE])
+            
+            # The decoded audio is not needed past this stage
+            self.silence_detector.release_audio()
             
-            abnormal = [s for s in silences if s['type'] == 'abnormal']
             results['silences'] = silences
-            results['abnormal_count'] = len(abnormal)
+            results['abnormal_count'] = abnormal_count
             
-            if abnormal:
-                self.update_signal.emit(f"⚠️ {len(abnormal)} blanc(s) anormal(aux) détecté(s)")
-                
-                # Send email alerts
-                for blank in abnormal:
-                    blank_info = {
-                        "file": self.audio_file,
-                        "start_time": blank['start_time'],
-                        "end_time": blank['end_time'],
-                        "duration": blank['duration']
-                    }
-                    self.email_sender.send_blank_alert(blank_info)
+            if abnormal_count:
+                pending.append(f"⚠️ {abnormal_count} blanc(s) anormal(aux) détecté(s)")
             else:
-                self.update_signal.emit("✅ Aucun blanc anormal détecté")
+                pending.append("✅ Aucun blanc anormal détecté")
             
             # 2. Transcribe (if enabled)
             if self.transcriber.config["ai"]["transcription"]:
-                self.update_signal.emit("🎙️ Transcription en cours (cela peut prendre du temps)...")
+                pending.append("🎙️ Transcription en cours (cela peut prendre du temps)...")
+                emit("\n".join(pending))
+                pending = []
                 
-                transcription_result = self.transcriber.transcribe_and_save(self.audio_file)
+                transcription_result = self.transcriber.transcribe_and_save(audio_file)
                 results['transcription'] = transcription_result
                 
-                self.update_signal.emit("✅ Transcription terminée")
+                pending.append("✅ Transcription terminée")
             
             results['success'] = True
             
         except Exception as e:
-            self.update_signal.emit(f"❌ Erreur: {str(e)}")
+            pending.append(f"❌ Erreur: {str(e)}")
             results['success'] = False
             results['error'] = str(e)
             
@@ -69,11 +92,13 @@ class ProcessingThread(QThread):
             error_info = {
                 "type": "Processing Error",
                 "message": str(e),
-                "file": self.audio_file,
+                "file": audio_file,
                 "time": ""
             }
             self.email_sender.send_error_alert(error_info)
         
+        if pending:
+            emit("\n".join(pending))
         self.finished_signal.emit(results)
 
 
@@ -90,10 +115,15 @@ class MainWindow(QMainWindow):
         # UI update timer
         self.update_timer = QTimer()
         self.update_timer.timeout.connect(self.update_recording_info)
+        self._max_duration = 60 * 60  # Max recording duration in seconds, set at start
+        self._last_ms = None  # (minutes, seconds) last shown
         
         # Processing thread
         self.processing_thread = None
         
+        # Device list text, built once
+        self._devices_text = None
+        
         self.init_ui()
         
     def init_ui(self):
@@ -213,10 +243,11 @@ class MainWindow(QMainWindow):
         info_group = QGroupBox("Informations et Logs")
         info_layout = QVBoxLayout()
         
-        self.info_box = QTextEdit()
+        self.info_box = QPlainTextEdit()  # Plain-text log, line-based layout
         self.info_box.setReadOnly(True)
+        self.info_box.setMaximumBlockCount(2000)  # Oldest lines dropped past 2000
         self.info_box.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #ecf0f1;
                 padding: 10px;
                 font-family: 'Courier New', monospace;
@@ -238,16 +269,29 @@ class MainWindow(QMainWindow):
         
     def display_audio_devices(self):
         """Display available audio devices"""
-        devices = self.recorder.list_audio_devices()
+        if self._devices_text is None or self.recorder.devices_dirty:
+            devices = self.recorder.list_audio_devices()
+            
+            if devices:
+                lines = ["🎤 Périphériques audio disponibles:"] + [
+                    f"   • [{d['index']}] {d['name']} ({d['channels']} canaux, {d['sample_rate']} Hz)"
+                    for d in devices
+                ]
+                self._devices_text = "\n".join(lines) + "\n"
+            else:
+                self._devices_text = "⚠️ Aucun périphérique audio détecté"
         
-        if devices:
-            device_text = "🎤 Périphériques audio disponibles:\n"
-            for device in devices:
-                device_text += f"   • [{device['index']}] {device['name']} ({device['channels']} canaux, {device['sample_rate']} Hz)\n"
-        else:
-            device_text = "⚠️ Aucun périphérique audio détecté"
+        self.info_box.setPlainText(self._devices_text)
         
-        self.info_box.setPlainText(device_text)
+    def _log_block(self, lines):
+        """Append several log lines with a single insert and repaint"""
+        self.info_box.setUpdatesEnabled(False)
+        cursor = self.info_box.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText("\n" + "\n".join(lines))  # Each line is a new paragraph, as with append
+        self.info_box.setTextCursor(cursor)
+        self.info_box.setUpdatesEnabled(True)
+        self.info_box.ensureCursorVisible()
         
     def start_recording(self):
         """Start audio recording"""
@@ -261,11 +305,17 @@ class MainWindow(QMainWindow):
             self.btn_config.setEnabled(False)
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(0)
-            self.update_timer.start(100)  # Update every 100ms
             
-            self.info_box.append(f"\n{'='*60}")
-            self.info_box.append(f"🔴 Enregistrement démarré: {self.recorder.current_file}")
-            self.info_box.append(f"{'='*60}")
+            # Read once per recording instead of on every timer tick
+            self._max_duration = self.recorder.config["audio"]["max_duration"] * 60
+            self._last_ms = None
+            self.update_timer.start(500)  # Update every 500ms (display has 1s resolution)
+            
+            self._log_block([
+                f"\n{'='*60}",
+                f"🔴 Enregistrement démarré: {self.recorder.current_file}",
+                f"{'='*60}"
+            ])
             
             self.statusBar.showMessage("🔴 Enregistrement en cours...")
         else:
@@ -288,7 +338,7 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         
         if saved_file:
-            self.info_box.append(f"\n✅ Fichier sauvegardé: {saved_file}")
+            self.info_box.appendPlainText(f"\n✅ Fichier sauvegardé: {saved_file}")
             self.statusBar.showMessage(f"✅ Enregistrement sauvegardé: {os.path.basename(saved_file)}")
             
             # Start post-processing
@@ -299,17 +349,19 @@ class MainWindow(QMainWindow):
         
     def update_recording_info(self):
         """Update recording information while recording"""
-        info = self.recorder.get_recording_info()
-        duration = info['duration']
+        duration = self.recorder.get_recording_duration()
+        
+        # Nothing visible changed since the last tick
+        minutes, seconds = divmod(int(duration), 60)
+        if (minutes, seconds) == self._last_ms:
+            return
+        self._last_ms = (minutes, seconds)
         
         # Update status
-        minutes = int(duration // 60)
-        seconds = int(duration % 60)
         self.status_label.setText(f"🔴 Enregistrement: {minutes:02d}:{seconds:02d}")
         
         # Update progress bar
-        max_duration = self.recorder.config["audio"]["max_duration"] * 60
-        progress = int((duration / max_duration) * 100)
+        progress = int((duration / self._max_duration) * 100)
         self.progress_bar.setValue(min(progress, 100))
         
         # Update status bar
@@ -317,9 +369,11 @@ class MainWindow(QMainWindow):
         
     def process_recording(self, audio_file):
         """Process recording: detect silences, transcribe, send alerts"""
-        self.info_box.append(f"\n{'='*60}")
-        self.info_box.append("🔄 Post-traitement en cours...")
-        self.info_box.append(f"{'='*60}")
+        self._log_block([
+            f"\n{'='*60}",
+            "🔄 Post-traitement en cours...",
+            f"{'='*60}"
+        ])
         
         self.status_label.setText("🔄 Analyse en cours...")
         self.status_label.setStyleSheet("color: #3498db;")
@@ -341,38 +395,39 @@ class MainWindow(QMainWindow):
         self.processing_thread.start()
         
     def on_processing_update(self, message):
-        """Handle processing updates"""
-        self.info_box.append(message)
-        self.statusBar.showMessage(message)
+        """Handle processing updates (one or more lines)"""
+        self.info_box.appendPlainText(message)
+        self.statusBar.showMessage(message.rsplit("\n", 1)[-1])
         
     def on_processing_finished(self, results):
         """Handle processing completion"""
-        self.info_box.append(f"\n{'='*60}")
+        lines = [f"\n{'='*60}"]
         
         if results.get('success'):
-            self.info_box.append("✅ Post-traitement terminé avec succès")
+            lines.append("✅ Post-traitement terminé avec succès")
             
             # Display summary
             if 'abnormal_count' in results:
                 if results['abnormal_count'] > 0:
-                    self.info_box.append(f"⚠️ {results['abnormal_count']} blanc(s) anormal(aux) détecté(s)")
+                    lines.append(f"⚠️ {results['abnormal_count']} blanc(s) anormal(aux) détecté(s)")
                 else:
-                    self.info_box.append("✅ Aucun problème détecté")
+                    lines.append("✅ Aucun problème détecté")
             
             if 'transcription' in results:
                 trans = results['transcription']
-                self.info_box.append(f"📝 Transcription: {trans.get('transcript', 'N/A')}")
-                self.info_box.append(f"📄 Résumé: {trans.get('summary', 'N/A')}")
+                lines.append(f"📝 Transcription: {trans.get('transcript', 'N/A')}")
+                lines.append(f"📄 Résumé: {trans.get('summary', 'N/A')}")
             
             self.status_label.setText("✅ Prêt")
             self.status_label.setStyleSheet("color: #27ae60;")
             
         else:
-            self.info_box.append(f"❌ Erreur: {results.get('error', 'Erreur inconnue')}")
+            lines.append(f"❌ Erreur: {results.get('error', 'Erreur inconnue')}")
             self.status_label.setText("❌ Erreur de traitement")
             self.status_label.setStyleSheet("color: #e74c3c;")
         
-        self.info_box.append(f"{'='*60}\n")
+        lines.append(f"{'='*60}\n")
+        self._log_block(lines)
         
         # Re-enable buttons
         self.btn_start_recording.setEnabled(True)
@@ -384,13 +439,13 @@ class MainWindow(QMainWindow):
         """Open configuration dialog"""
         dialog = ConfigDialog(self)
         if dialog.exec_():
-            # Reload configurations
-            self.recorder = AudioRecorder()
-            self.silence_detector = SilenceDetector()
-            self.transcriber = AudioTranscriber()
-            self.email_sender = EmailSender()
+            # Reload configurations in place (loaded model, SMTP connection and caches are kept)
+            self.recorder.reload_config()
+            self.silence_detector.reload_config()
+            self.transcriber.reload_config()
+            self.email_sender.reload_config()
             
-            self.info_box.append("\n⚙️ Configuration mise à jour")
+            self.info_box.appendPlainText("\n⚙️ Configuration mise à jour")
             self.statusBar.showMessage("✅ Configuration sauvegardée")
     
     def closeEvent(self, event):
@@ -406,8 +461,15 @@ class MainWindow(QMainWindow):
             
             if reply == QMessageBox.Yes:
                 self.recorder.stop_recording()
+                self._flush_emails()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self._flush_emails()
             event.accept()
+    
+    def _flush_emails(self):
+        """Give queued alerts a few seconds to go out, without hanging the window on SMTP"""
+        if self.email_sender.flush(timeout=EMAIL_FLUSH_TIMEOUT):
+            self.email_sender.close()
@@ -2,20 +2,178 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-import json
+import threading
+import queue
+import time
 import os
+from settings import load_settings
+
+# Seconds before a blocking SMTP operation (connect, login, send) gives up
+_SMTP_TIMEOUT = 10
+
+# HTML templates, filled with str.format_map on each alert
+
+_HTML_PREFIX = """
+            <html>
+                <body style="font-family: Arial, sans-serif;">
+                    """
+
+_HTML_SUFFIX = """
+                    <hr>
+                    <p style="color: gray; font-size: 12px;">
+                        Envoyé automatiquement par le Module d'Enregistrement Audio<br>
+                        {timestamp}
+                    </p>
+                </body>
+            </html>
+            """
+
+_BLANK_ROW = """
+            <tr>
+                <td style="padding: 8px;">{file}</td>
+                <td style="padding: 8px;">{start}</td>
+                <td style="padding: 8px;">{end}</td>
+                <td style="padding: 8px; color: #d9534f;"><strong>{duration:.2f} secondes</strong></td>
+            </tr>"""
+
+_BLANK_TEMPLATE = """
+        <h2 style="color: #d9534f;">{title}</h2>
+        
+        <p><strong>{intro}</strong></p>
+        
+        <table style="border-collapse: collapse; width: 100%;">
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Fichier:</strong></td>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Heure de début:</strong></td>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Heure de fin:</strong></td>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Durée:</strong></td>
+            </tr>{rows}
+        </table>
+        
+        <p style="margin-top: 20px;">
+            <strong>Action requise:</strong> Vérifiez l'enregistrement et l'équipement audio.
+        </p>
+        """
+
+_ERROR_TEMPLATE = """
+        <h2 style="color: #d9534f;">❌ Erreur d'enregistrement</h2>
+        
+        <p><strong>Une erreur est survenue lors de l'enregistrement.</strong></p>
+        
+        <div style="background-color: #f8d7da; border: 1px solid #f5c6cb; padding: 15px; border-radius: 5px;">
+            <p><strong>Type d'erreur:</strong> {type}</p>
+            <p><strong>Message:</strong> {message}</p>
+            <p><strong>Fichier concerné:</strong> {file}</p>
+            <p><strong>Heure:</strong> {time}</p>
+        </div>
+        
+        <p style="margin-top: 20px;">
+            <strong>Action requise:</strong> Vérifiez le système et relancez l'enregistrement si nécessaire.
+        </p>
+        """
+
+_STORAGE_TEMPLATE = """
+        <h2 style="color: #f0ad4e;">⚠️ Espace disque faible</h2>
+        
+        <p><strong>L'espace disque disponible est insuffisant.</strong></p>
+        
+        <table style="border-collapse: collapse; width: 100%;">
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Chemin:</strong></td>
+                <td style="padding: 8px;">{path}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Espace disponible:</strong></td>
+                <td style="padding: 8px; color: #f0ad4e;"><strong>{available_gb:.2f} GB</strong></td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Espace total:</strong></td>
+                <td style="padding: 8px;">{total_gb:.2f} GB</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Utilisation:</strong></td>
+                <td style="padding: 8px;">{usage_percent:.1f}%</td>
+            </tr>
+        </table>
+        
+        <p style="margin-top: 20px;">
+            <strong>Action requise:</strong> Libérez de l'espace disque ou supprimez les anciens enregistrements.
+        </p>
+        """
+
+_DAILY_TEMPLATE = """
+        <h2 style="color: #5cb85c;">📊 Rapport quotidien d'enregistrement</h2>
+        
+        <h3>Résumé du {date}</h3>
+        
+        <table style="border-collapse: collapse; width: 100%;">
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Nombre d'enregistrements:</strong></td>
+                <td style="padding: 8px;">{total_recordings}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Durée totale:</strong></td>
+                <td style="padding: 8px;">{total_duration}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Taille totale:</strong></td>
+                <td style="padding: 8px;">{total_size}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Blancs anormaux:</strong></td>
+                <td style="padding: 8px;">{abnormal_blanks}</td>
+            </tr>
+            <tr>
+                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Erreurs:</strong></td>
+                <td style="padding: 8px;">{errors}</td>
+            </tr>
+        </table>
+        
+        <h3 style="margin-top: 20px;">Fichiers créés</h3>
+        <ul>
+        {files}
+        </ul>
+        
+        <p style="margin-top: 20px; color: gray; font-size: 12px;">
+            Ce rapport est généré automatiquement chaque jour.
+        </p>
+        """
+
 
 class EmailSender:
     def __init__(self, config_file="config/settings.json"):
         """Initialize email sender with configuration"""
-        self.config = self.load_config(config_file)
+        self.config_file = config_file
+        
+        # SMTP connection kept open across alerts (STARTTLS + login once)
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        
+        # Emails are sent by a background worker so callers never wait on SMTP
+        self._queue = queue.Queue()
+        threading.Thread(target=self._worker, daemon=True).start()
+        
+        self.config = {}
+        self.reload_config()
+        
+    def reload_config(self):
+        """Reload the configuration (and parse the recipient list once)"""
+        old_config = self.config
+        self.config = self.load_config(self.config_file)
+        self._recipients = [
+            r.strip() for r in self.config.get("recipients", "").split(';') if r.strip()
+        ]
+        
+        # Reconnect only if the server or the credentials changed
+        if any(old_config.get(key) != self.config.get(key)
+               for key in ("smtp_server", "smtp_port", "sender_email", "password")):
+            self.close()
         
     def load_config(self, config_file):
         """Load email configuration"""
         if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                return config.get("email", {})
+            config = load_settings(config_file)
+            return config.get("email", {})
         else:
             return {
                 "enabled": False,
@@ -31,7 +189,7 @@ class EmailSender:
     
     def send_email(self, subject, body, recipients=None):
         """
-        Send email alert
+        Queue an email alert (sent by the background worker)
         
         Args:
             subject: Email subject
@@ -39,23 +197,32 @@ class EmailSender:
             recipients: List of recipients (default: from config)
             
         Returns:
-            True if sent successfully, False otherwise
+            True if queued for sending, False otherwise
+        """
+        prepared = self._prepare_email(subject, body, recipients)
+        if prepared is None:
+            return False
+        
+        self._queue.put(prepared)
+        return True
+    
+    def _prepare_email(self, subject, body, recipients=None):
+        """
+        Check the configuration and build the message
+        
+        Returns:
+            (message, recipients), or None if the email cannot be sent
         """
         if not self.config.get("enabled", False):
             print("⚠️ Email alerts are disabled in configuration")
-            return False
+            return None
         
-        # Get recipients
-        if recipients is None:
-            recipients_str = self.config.get("recipients", "")
-            if not recipients_str:
-                print("❌ No recipients configured")
-                return False
-            recipients = [r.strip() for r in recipients_str.split(';') if r.strip()]
+        # Get recipients (parsed once in reload)
+        recipients = recipients or self._recipients
         
         if not recipients:
             print("❌ No valid recipients")
-            return False
+            return None
         
         # Get sender info
         sender_email = self.config.get("sender_email", "")
@@ -63,40 +230,45 @@ class EmailSender:
         
         if not sender_email or not password:
             print("❌ Sender email or password not configured")
-            return False
+            return None
+        
+        # Create message
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = sender_email
+        message["To"] = ", ".join(recipients)
+        
+        # Add body
+        html_body = "".join((
+            _HTML_PREFIX,
+            body,
+            _HTML_SUFFIX.format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        ))
+        
+        part = MIMEText(html_body, "html")
+        message.attach(part)
         
+        return message, recipients
+    
+    def _send_email_sync(self, message, recipients):
+        """
+        Send a prepared message over SMTP
+        
+        Returns:
+            True if sent successfully, False otherwise
+        """
         try:
-            # Create message
-            message = MIMEMultipart("alternative")
-            message["Subject"] = subject
-            message["From"] = sender_email
-            message["To"] = ", ".join(recipients)
-            
-            # Add body
-            html_body = f"""
-            <html>
-                <body style="font-family: Arial, sans-serif;">
-                    {body}
-                    <hr>
-                    <p style="color: gray; font-size: 12px;">
-                        Envoyé automatiquement par le Module d'Enregistrement Audio<br>
-                        {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                    </p>
-                </body>
-            </html>
-            """
-            
-            part = MIMEText(html_body, "html")
-            message.attach(part)
+            # Serialized once, sendmail skips send_message's header re-parsing
+            sender_email = message["From"]
+            data = message.as_bytes()
             
-            # Connect to SMTP server
-            smtp_server = self.config.get("smtp_server", "smtp.gmail.com")
-            smtp_port = self.config.get("smtp_port", 587)
-            
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(sender_email, password)
-                server.send_message(message)
+            # Send on the shared connection, reconnecting once if the server dropped it
+            with self._smtp_lock:
+                try:
+                    self._get_smtp().sendmail(sender_email, recipients, data)
+                except smtplib.SMTPServerDisconnected:
+                    self._smtp = None
+                    self._get_smtp().sendmail(sender_email, recipients, data)
             
             print(f"✅ Email sent to {len(recipients)} recipient(s)")
             return True
@@ -105,6 +277,85 @@ class EmailSender:
             print(f"❌ Error sending email: {e}")
             return False
     
+    def _worker(self):
+        """Background loop sending the queued emails one by one"""
+        while True:
+            message, recipients = self._queue.get()
+            try:
+                self._send_email_sync(message, recipients)
+            finally:
+                self._queue.task_done()
+    
+    def flush(self, timeout=None):
+        """
+        Wait until every queued email has been sent
+        
+        Args:
+            timeout: Maximum wait in seconds (default: no limit)
+            
+        Returns:
+            True if the queue was emptied, False if the timeout expired first
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _get_smtp(self):
+        """
+        Return the open SMTP connection, (re)connecting if needed
+        
+        Must be called with self._smtp_lock held.
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        
+        smtp_server = self.config.get("smtp_server", "smtp.gmail.com")
+        smtp_port = self.config.get("smtp_port", 587)
+        
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=_SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.config.get("sender_email", ""), self.config.get("password", ""))
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """Drop the current SMTP connection (lock held)"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+    
+    def close(self):
+        """Close the SMTP connection kept between alerts"""
+        with self._smtp_lock:
+            self._close_smtp()
+    
+    def _alert_enabled(self, flag):
+        """True if emails are enabled and this alert type is on (checked before building the body)"""
+        return self.config.get("enabled", False) and self.config.get(flag, True)
+    
     def send_blank_alert(self, blank_info):
         """
         Send alert for abnormal silence/blank detection
@@ -119,39 +370,41 @@ class EmailSender:
                     "type": "abnormal"
                 }
         """
-        if not self.config.get("alert_blank", True):
-            return False
-        
-        subject = "⚠️ ALERTE: Blanc anormal détecté"
-        
-        body = f"""
-        <h2 style="color: #d9534f;">⚠️ Blanc anormal détecté</h2>
-        
-        <p><strong>Un silence anormal a été détecté dans l'enregistrement.</strong></p>
-        
-        <table style="border-collapse: collapse; width: 100%;">
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Fichier:</strong></td>
-                <td style="padding: 8px;">{blank_info.get('file', 'N/A')}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Heure de début:</strong></td>
-                <td style="padding: 8px;">{self._format_time(blank_info.get('start_time', 0))}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Heure de fin:</strong></td>
-                <td style="padding: 8px;">{self._format_time(blank_info.get('end_time', 0))}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Durée:</strong></td>
-                <td style="padding: 8px; color: #d9534f;"><strong>{blank_info.get('duration', 0):.2f} secondes</strong></td>
-            </tr>
-        </table>
+        return self.send_blank_alert_batch([blank_info])
+    
+    def send_blank_alert_batch(self, blanks):
+        """
+        Send a single alert listing several abnormal silences/blanks
         
-        <p style="margin-top: 20px;">
-            <strong>Action requise:</strong> Vérifiez l'enregistrement et l'équipement audio.
-        </p>
+        Args:
+            blanks: List of dictionaries with blank details (see send_blank_alert)
+            
+        Returns:
+            True if sent successfully, False otherwise
         """
+        if not self._alert_enabled("alert_blank") or not blanks:
+            return False
+        
+        if len(blanks) == 1:
+            subject = "⚠️ ALERTE: Blanc anormal détecté"
+            title = "⚠️ Blanc anormal détecté"
+            intro = "Un silence anormal a été détecté dans l'enregistrement."
+        else:
+            subject = f"⚠️ ALERTE: {len(blanks)} blancs anormaux détectés"
+            title = f"⚠️ {len(blanks)} blancs anormaux détectés"
+            intro = f"{len(blanks)} silences anormaux ont été détectés dans l'enregistrement."
+        
+        rows = "".join(
+            _BLANK_ROW.format_map({
+                "file": blank.get('file', 'N/A'),
+                "start": self._format_time(blank.get('start_time', 0)),
+                "end": self._format_time(blank.get('end_time', 0)),
+                "duration": blank.get('duration', 0)
+            })
+            for blank in blanks
+        )
+        
+        body = _BLANK_TEMPLATE.format_map({"title": title, "intro": intro, "rows": rows})
         
         return self.send_email(subject, body)
     
@@ -162,27 +415,17 @@ class EmailSender:
         Args:
             error_info: Dictionary with error details
         """
-        if not self.config.get("alert_error", True):
+        if not self._alert_enabled("alert_error"):
             return False
         
         subject = "❌ ERREUR: Problème d'enregistrement"
         
-        body = f"""
-        <h2 style="color: #d9534f;">❌ Erreur d'enregistrement</h2>
-        
-        <p><strong>Une erreur est survenue lors de l'enregistrement.</strong></p>
-        
-        <div style="background-color: #f8d7da; border: 1px solid #f5c6cb; padding: 15px; border-radius: 5px;">
-            <p><strong>Type d'erreur:</strong> {error_info.get('type', 'Inconnu')}</p>
-            <p><strong>Message:</strong> {error_info.get('message', 'N/A')}</p>
-            <p><strong>Fichier concerné:</strong> {error_info.get('file', 'N/A')}</p>
-            <p><strong>Heure:</strong> {error_info.get('time', datetime.now().strftime('%H:%M:%S'))}</p>
-        </div>
-        
-        <p style="margin-top: 20px;">
-            <strong>Action requise:</strong> Vérifiez le système et relancez l'enregistrement si nécessaire.
-        </p>
-        """
+        body = _ERROR_TEMPLATE.format_map({
+            "type": error_info.get('type', 'Inconnu'),
+            "message": error_info.get('message', 'N/A'),
+            "file": error_info.get('file', 'N/A'),
+            "time": error_info.get('time', datetime.now().strftime('%H:%M:%S'))
+        })
         
         return self.send_email(subject, body)
     
@@ -193,39 +436,17 @@ class EmailSender:
         Args:
             storage_info: Dictionary with storage details
         """
-        if not self.config.get("alert_storage", True):
+        if not self._alert_enabled("alert_storage"):
             return False
         
         subject = "⚠️ ALERTE: Espace disque faible"
         
-        body = f"""
-        <h2 style="color: #f0ad4e;">⚠️ Espace disque faible</h2>
-        
-        <p><strong>L'espace disque disponible est insuffisant.</strong></p>
-        
-        <table style="border-collapse: collapse; width: 100%;">
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Chemin:</strong></td>
-                <td style="padding: 8px;">{storage_info.get('path', 'N/A')}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Espace disponible:</strong></td>
-                <td style="padding: 8px; color: #f0ad4e;"><strong>{storage_info.get('available_gb', 0):.2f} GB</strong></td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Espace total:</strong></td>
-                <td style="padding: 8px;">{storage_info.get('total_gb', 0):.2f} GB</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Utilisation:</strong></td>
-                <td style="padding: 8px;">{storage_info.get('usage_percent', 0):.1f}%</td>
-            </tr>
-        </table>
-        
-        <p style="margin-top: 20px;">
-            <strong>Action requise:</strong> Libérez de l'espace disque ou supprimez les anciens enregistrements.
-        </p>
-        """
+        body = _STORAGE_TEMPLATE.format_map({
+            "path": storage_info.get('path', 'N/A'),
+            "available_gb": storage_info.get('available_gb', 0),
+            "total_gb": storage_info.get('total_gb', 0),
+            "usage_percent": storage_info.get('usage_percent', 0)
+        })
         
         return self.send_email(subject, body)
     
@@ -236,50 +457,21 @@ class EmailSender:
         Args:
             report_data: Dictionary with report information
         """
-        subject = f"📊 Rapport quotidien - {datetime.now().strftime('%Y-%m-%d')}"
-        
-        body = f"""
-        <h2 style="color: #5cb85c;">📊 Rapport quotidien d'enregistrement</h2>
-        
-        <h3>Résumé du {datetime.now().strftime('%Y-%m-%d')}</h3>
-        
-        <table style="border-collapse: collapse; width: 100%;">
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Nombre d'enregistrements:</strong></td>
-                <td style="padding: 8px;">{report_data.get('total_recordings', 0)}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Durée totale:</strong></td>
-                <td style="padding: 8px;">{report_data.get('total_duration', '0h 0m')}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Taille totale:</strong></td>
-                <td style="padding: 8px;">{report_data.get('total_size', '0 MB')}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Blancs anormaux:</strong></td>
-                <td style="padding: 8px;">{report_data.get('abnormal_blanks', 0)}</td>
-            </tr>
-            <tr>
-                <td style="padding: 8px; background-color: #f5f5f5;"><strong>Erreurs:</strong></td>
-                <td style="padding: 8px;">{report_data.get('errors', 0)}</td>
-            </tr>
-        </table>
-        
-        <h3 style="margin-top: 20px;">Fichiers créés</h3>
-        <ul>
-        """
+        if not self.config.get("enabled", False):
+            return False
         
-        for file_info in report_data.get('files', []):
-            body += f"<li>{file_info}</li>"
+        date = datetime.now().strftime('%Y-%m-%d')
+        subject = f"📊 Rapport quotidien - {date}"
         
-        body += """
-        </ul>
-        
-        <p style="margin-top: 20px; color: gray; font-size: 12px;">
-            Ce rapport est généré automatiquement chaque jour.
-        </p>
-        """
+        body = _DAILY_TEMPLATE.format_map({
+            "date": date,
+            "total_recordings": report_data.get('total_recordings', 0),
+            "total_duration": report_data.get('total_duration', '0h 0m'),
+            "total_size": report_data.get('total_size', '0 MB'),
+            "abnormal_blanks": report_data.get('abnormal_blanks', 0),
+            "errors": report_data.get('errors', 0),
+            "files": "".join(f"<li>{file_info}</li>" for file_info in report_data.get('files', []))
+        })
         
         return self.send_email(subject, body)
     
@@ -314,7 +506,13 @@ class EmailSender:
         <p>Vous recevrez désormais les alertes automatiques.</p>
         """
         
-        return self.send_email(subject, body)
+        # Sent synchronously so the result reflects the real SMTP exchange
+        prepared = self._prepare_email(subject, body)
+        if prepared is None:
+            return False
+        
+        self.flush()
+        return self._send_email_sync(*prepared)
 
 
 # CLI Test
@@ -338,3 +536,4 @@ if __name__ == "__main__":
         "type": "abnormal"
     }
     sender.send_blank_alert(blank_info)
+    sender.flush()
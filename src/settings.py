@@ -0,0 +1,27 @@
+import copy
+import json
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _parse_settings(config_file, mtime_ns):
+    """Parse a settings file once per (path, mtime)"""
+    with open(config_file, 'rb') as f:
+        return json.loads(f.read())
+
+
+def load_settings(config_file):
+    """
+    Load a JSON settings file, parsed again only when it changes on disk
+
+    Args:
+        config_file: Path to the JSON file
+
+    Returns:
+        A copy of the parsed settings, callers may modify it freely
+
+    Raises:
+        FileNotFoundError: If config_file does not exist
+    """
+    return copy.deepcopy(_parse_settings(config_file, os.stat(config_file).st_mtime_ns))
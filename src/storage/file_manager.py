@@ -2,21 +2,179 @@ import os
 import json
 import shutil
 from datetime import datetime, timedelta
-from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import atexit
 import sqlite3
+from settings import load_settings
+
+# Bumped whenever _create_tables changes (stored in PRAGMA user_version)
+SCHEMA_VERSION = 2
+
+# Rows per executemany call in the bulk inserts
+BULK_CHUNK = 500
+
+# Above this many files, delete_old_recordings unlinks from a thread pool
+DELETE_POOL_THRESHOLD = 32
+
+# Files written next to a recording, removed along with it
+_ASSOCIATED_SUFFIXES = ('_transcript.txt', '_timestamped.txt', '_summary.txt', '_data.json')
+
+# Statements run on every insert, kept as constants so the connection's
+# statement cache always hits the same compiled query
+_INS_REC = """
+    INSERT INTO recordings (filename, filepath, file_size, duration, 
+                            format, sample_rate, created_date, 
+                            transcribed, has_abnormal_blanks, blank_count, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INS_REC_IGNORE = _INS_REC.replace("INSERT", "INSERT OR IGNORE", 1)
+_INS_BLANK = """
+    INSERT INTO blanks (recording_id, start_time, end_time, duration, type, alerted)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INS_TRANS = """
+    INSERT INTO transcriptions (recording_id, transcript_file, language, word_count, created_date)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_UPD_TRANSCRIBED = "UPDATE recordings SET transcribed = 1 WHERE id = ?"
+
+# Blank counts come from one aggregate over the recording's blanks.
+# UPDATE ... FROM needs SQLite 3.33+, older versions aggregate then update.
+_HAS_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+_UPD_BLANK_COUNTS = """
+    UPDATE recordings 
+    SET blank_count = c.n, has_abnormal_blanks = c.a
+    FROM (SELECT COUNT(*) AS n, COALESCE(MAX(type = 'abnormal'), 0) AS a
+          FROM blanks WHERE recording_id = ?) AS c
+    WHERE id = ?
+"""
+_SEL_BLANK_COUNTS = """
+    SELECT COUNT(*), COALESCE(MAX(CASE WHEN type = 'abnormal' THEN 1 ELSE 0 END), 0)
+    FROM blanks WHERE recording_id = ?
+"""
+_SET_BLANK_COUNTS = "UPDATE recordings SET blank_count = ?, has_abnormal_blanks = ? WHERE id = ?"
+
+# Tables hanging off recordings ({name} is the table name, see _add_cascade)
+_CHILD_TABLES = {
+    "transcriptions": """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recording_id INTEGER,
+            transcript_file TEXT,
+            language TEXT,
+            word_count INTEGER,
+            created_date TEXT,
+            FOREIGN KEY (recording_id) REFERENCES recordings (id) ON DELETE CASCADE
+        )
+    """,
+    "blanks": """
+        CREATE TABLE IF NOT EXISTS {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recording_id INTEGER,
+            start_time REAL,
+            end_time REAL,
+            duration REAL,
+            type TEXT,
+            alerted BOOLEAN DEFAULT 0,
+            FOREIGN KEY (recording_id) REFERENCES recordings (id) ON DELETE CASCADE
+        )
+    """
+}
+
+# Columns returned by the listing methods unless the full row is asked for
+_LIST_COLUMNS = "id, filename, filepath, created_date, file_size, duration, transcribed, has_abnormal_blanks, blank_count"
+
+# Extensions cleanup_orphaned_files treats as recordings
+_AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.flac', '.ogg', '.m4a'})
+
+
+def _iter_audio_files(root):
+    """Yield the audio files under root in one scandir walk
+    
+    scandir's entries carry the file type, so no stat() is needed per entry.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_audio_files(entry.path)
+            elif os.path.splitext(entry.name)[1].lower() in _AUDIO_EXTENSIONS:
+                yield entry.path
+
+
+def _safe_unlink(path):
+    """Remove a file, returning its path (None if it could not be removed)"""
+    try:
+        os.remove(path)
+        return path
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"❌ Error deleting {path}: {e}")
+        return None
+
+
+def _recording_values(path, info, created_date):
+    """INSERT parameters for a recording
+    
+    Args:
+        path: File path, or an os.DirEntry from a scandir walk (its name
+            and cached stat are reused)
+        info: Optional column values (duration, format, notes, ...)
+        created_date: ISO timestamp for the row
+    """
+    if isinstance(path, os.DirEntry):
+        filename, filepath, file_size = path.name, path.path, path.stat().st_size
+    else:
+        filepath = os.fspath(path)
+        filename, file_size = os.path.basename(filepath), os.stat(filepath).st_size
+    
+    return (
+        filename,
+        filepath,
+        file_size,
+        info.get('duration', 0),
+        info.get('format', 'unknown'),
+        info.get('sample_rate', 44100),
+        created_date,
+        info.get('transcribed', False),
+        info.get('has_abnormal_blanks', False),
+        info.get('blank_count', 0),
+        info.get('notes', '')
+    )
+
 
 class FileManager:
-    def __init__(self, config_file="config/settings.json", db_file="data/recordings.db"):
-        """Initialize file manager with database"""
+    def __init__(self, config_file="config/settings.json", db_file="data/recordings.db", verbose=False):
+        """Initialize file manager with database
+        
+        Args:
+            config_file: Settings file (storage section)
+            db_file: SQLite database path
+            verbose: Print a line for every database write (off for library use)
+        """
         self.config = self.load_config(config_file)
         self.db_file = db_file
+        self.verbose = verbose
+        
+        # One connection for the manager's lifetime (autocommit mode, explicit
+        # transactions through _transaction). The lock serializes threads.
+        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None,
+                                    cached_statements=256)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        atexit.register(self.conn.close)
+        
         self.init_database()
         
     def load_config(self, config_file):
         """Load configuration"""
-        if os.path.exists(config_file):
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        try:
+            return load_settings(config_file)
+        except FileNotFoundError:
+            pass
         return {
             "storage": {
                 "path": "data/recordings",
@@ -25,13 +183,51 @@ class FileManager:
             }
         }
     
+    @contextmanager
+    def _transaction(self):
+        """Cursor inside BEGIN ... COMMIT (ROLLBACK on error), with the lock held
+        
+        The connection is in autocommit mode, so the transaction is opened
+        explicitly; the connection's own context manager commits it on exit
+        and rolls it back if the block raises.
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN")
+            yield cursor
+    
     def init_database(self):
         """Initialize SQLite database"""
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
-        
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
+        with self._lock:
+            # Connection settings, issued once: WAL lets readers run during writes,
+            # NORMAL only fsyncs at checkpoints, 64 MB page cache
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-64000")
+        
+        # The schema (tables, indexes, migrations) only needs to be run on
+        # databases created by an older version of this code
+        with self._transaction() as cursor:
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                self._fts = cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'recordings_fts'"
+                ).fetchone() is not None
+            else:
+                self._create_tables(cursor)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
+        # Enforce the foreign keys (child rows follow their recording on delete).
+        # Turned on after the tables so older databases migrate unchecked.
+        with self._lock:
+            self.conn.execute("PRAGMA foreign_keys=ON")
+        
+        if self.verbose:
+            print(f"✅ Database initialized: {self.db_file}")
+    
+    def _create_tables(self, cursor):
+        """Create the tables if they do not exist yet"""
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS recordings (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,138 +245,228 @@ class FileManager:
             )
         """)
         
+        for table, ddl in _CHILD_TABLES.items():
+            cursor.execute(ddl.format(name=table))
+            self._add_cascade(cursor, table, ddl)
+        
+        # Listing / date filters, abnormal filter, and per-recording lookups
+        # (blank recounts, cascade deletes)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rec_created ON recordings(created_date DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rec_abn ON recordings(has_abnormal_blanks, created_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_blanks_rec ON blanks(recording_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_trans_rec ON transcriptions(recording_id)")
+        
+        # Partial indexes holding only the rare rows: recordings with abnormal
+        # blanks, recordings still waiting for a transcription
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rec_abn_only ON recordings(id) WHERE has_abnormal_blanks = 1")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_rec_not_transcribed ON recordings(id) WHERE transcribed = 0")
+        
+        self._fts = self._create_fts(cursor)
+    
+    def _add_cascade(self, cursor, table, ddl):
+        """Rebuild a child table created before its foreign key had ON DELETE CASCADE"""
+        foreign_keys = cursor.execute(f"PRAGMA foreign_key_list({table})").fetchall()
+        if all(fk["on_delete"] == "CASCADE" for fk in foreign_keys):
+            return
+        
+        # SQLite cannot alter a constraint: copy into a new table and swap
+        cursor.execute(ddl.format(name=f"{table}_new"))
+        cursor.execute(f"INSERT INTO {table}_new SELECT * FROM {table}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        print(f"🔧 Migrated table {table} to ON DELETE CASCADE")
+    
+    def _create_fts(self, cursor):
+        """Full-text index on filename/notes for keyword search
+        
+        Uses the trigram tokenizer so MATCH finds the same substrings as
+        LIKE '%keyword%'. Kept in sync with recordings by triggers.
+        
+        Returns:
+            True if the index is available (needs FTS5 with trigram, SQLite 3.34+)
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'recordings_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE recordings_fts USING fts5(
+                    filename, notes, content='recordings', content_rowid='id', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS transcriptions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                recording_id INTEGER,
-                transcript_file TEXT,
-                language TEXT,
-                word_count INTEGER,
-                created_date TEXT,
-                FOREIGN KEY (recording_id) REFERENCES recordings (id)
-            )
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_ai AFTER INSERT ON recordings BEGIN
+                INSERT INTO recordings_fts (rowid, filename, notes) VALUES (new.id, new.filename, new.notes);
+            END
         """)
-        
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS blanks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                recording_id INTEGER,
-                start_time REAL,
-                end_time REAL,
-                duration REAL,
-                type TEXT,
-                alerted BOOLEAN DEFAULT 0,
-                FOREIGN KEY (recording_id) REFERENCES recordings (id)
-            )
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_ad AFTER DELETE ON recordings BEGIN
+                INSERT INTO recordings_fts (recordings_fts, rowid, filename, notes)
+                VALUES ('delete', old.id, old.filename, old.notes);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS recordings_fts_au AFTER UPDATE OF filename, notes ON recordings BEGIN
+                INSERT INTO recordings_fts (recordings_fts, rowid, filename, notes)
+                VALUES ('delete', old.id, old.filename, old.notes);
+                INSERT INTO recordings_fts (rowid, filename, notes) VALUES (new.id, new.filename, new.notes);
+            END
         """)
         
-        conn.commit()
-        conn.close()
-        
-        print(f"✅ Database initialized: {self.db_file}")
+        # Index the recordings that existed before the table
+        cursor.execute("INSERT INTO recordings_fts (recordings_fts) VALUES ('rebuild')")
+        return True
     
     def add_recording(self, filepath, **kwargs):
-        """Add a recording to the database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
+        """Add a recording to the database (filepath may be an os.DirEntry)"""
+        values = _recording_values(filepath, kwargs, datetime.now().isoformat())
+        filename, filepath = values[0], values[1]
         
         try:
-            # Get file info
-            file_size = os.path.getsize(filepath)
-            filename = os.path.basename(filepath)
-            created_date = datetime.now().isoformat()
-            
-            cursor.execute("""
-                INSERT INTO recordings (filename, filepath, file_size, duration, 
-                                      format, sample_rate, created_date, 
-                                      transcribed, has_abnormal_blanks, blank_count, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                filename,
-                filepath,
-                file_size,
-                kwargs.get('duration', 0),
-                kwargs.get('format', 'unknown'),
-                kwargs.get('sample_rate', 44100),
-                created_date,
-                kwargs.get('transcribed', False),
-                kwargs.get('has_abnormal_blanks', False),
-                kwargs.get('blank_count', 0),
-                kwargs.get('notes', '')
-            ))
-            
-            recording_id = cursor.lastrowid
-            conn.commit()
+            with self._transaction() as cursor:
+                cursor.execute(_INS_REC, values)
+                
+                recording_id = cursor.lastrowid
             
-            print(f"✅ Recording added to database: {filename} (ID: {recording_id})")
+            if self.verbose:
+                print(f"✅ Recording added to database: {filename} (ID: {recording_id})")
             return recording_id
             
         except sqlite3.IntegrityError:
             print(f"⚠️ Recording already exists: {filepath}")
             return None
-        finally:
-            conn.close()
+    
+    def add_recordings_bulk(self, rows):
+        """Add several recordings in a single transaction
+        
+        Args:
+            rows: Iterable of dicts with a 'filepath' key (path or os.DirEntry)
+                and the same optional keys as add_recording's kwargs
+        
+        Returns:
+            Number of recordings inserted (files already in the database are skipped)
+        """
+        created_date = datetime.now().isoformat()
+        values = [_recording_values(row['filepath'], row, created_date) for row in rows]
+        
+        inserted = 0
+        with self._transaction() as cursor:
+            for i in range(0, len(values), BULK_CHUNK):
+                cursor.executemany(_INS_REC_IGNORE, values[i:i + BULK_CHUNK])
+                inserted += cursor.rowcount
+        
+        if self.verbose:
+            print(f"✅ {inserted} recording(s) added to database")
+        return inserted
     
     def add_transcription(self, recording_id, transcript_file, language, word_count):
         """Add transcription info to database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO transcriptions (recording_id, transcript_file, language, word_count, created_date)
-            VALUES (?, ?, ?, ?, ?)
-        """, (recording_id, transcript_file, language, word_count, datetime.now().isoformat()))
-        
-        # Update recording as transcribed
-        cursor.execute("UPDATE recordings SET transcribed = 1 WHERE id = ?", (recording_id,))
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.execute(_INS_TRANS, (recording_id, transcript_file, language, word_count, datetime.now().isoformat()))
+            
+            # Update recording as transcribed
+            cursor.execute(_UPD_TRANSCRIBED, (recording_id,))
         
-        print(f"✅ Transcription added for recording ID: {recording_id}")
+        if self.verbose:
+            print(f"✅ Transcription added for recording ID: {recording_id}")
     
     def add_blank(self, recording_id, start_time, end_time, duration, blank_type, alerted=False):
-        """Add blank/silence info to database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO blanks (recording_id, start_time, end_time, duration, type, alerted)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (recording_id, start_time, end_time, duration, blank_type, alerted))
+        """Add blank/silence info to database
         
-        # Update recording blank count
-        cursor.execute("""
-            UPDATE recordings 
-            SET blank_count = (SELECT COUNT(*) FROM blanks WHERE recording_id = ?),
-                has_abnormal_blanks = (SELECT COUNT(*) > 0 FROM blanks WHERE recording_id = ? AND type = 'abnormal')
-            WHERE id = ?
-        """, (recording_id, recording_id, recording_id))
-        
-        conn.commit()
-        conn.close()
+        Single-row wrapper kept for existing callers; loops over the blanks
+        of one recording should use add_blanks_for_recording.
+        """
+        self.add_blanks_for_recording(recording_id, ((start_time, end_time, duration, blank_type, alerted),))
     
-    def get_all_recordings(self):
-        """Get all recordings from database"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM recordings ORDER BY created_date DESC")
-        columns = [description[0] for description in cursor.description]
-        recordings = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    def add_blanks_for_recording(self, recording_id, blanks):
+        """Add all blanks of a recording in a single transaction
+        
+        Args:
+            recording_id: Recording the blanks belong to
+            blanks: Iterable (a generator is fine, it is consumed as the rows
+                are inserted) of (start_time, end_time, duration, type, alerted)
+        
+        Returns:
+            Number of blanks inserted
+        """
+        with self._transaction() as cursor:
+            cursor.executemany(_INS_BLANK, (
+                (recording_id, start, end, duration, blank_type, alerted)
+                for start, end, duration, blank_type, alerted in blanks
+            ))
+            inserted = cursor.rowcount
+            
+            # Recount once for the whole batch
+            self._update_blank_counts(cursor, recording_id)
         
-        conn.close()
-        return recordings
+        return inserted
     
-    def search_recordings(self, keyword=None, start_date=None, end_date=None, has_blanks=None):
-        """Search recordings with filters"""
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM recordings WHERE 1=1"
+    def add_blanks_bulk(self, recording_id, rows):
+        """Same as add_blanks_for_recording, for an already built list of rows"""
+        return self.add_blanks_for_recording(recording_id, rows)
+    
+    def _update_blank_counts(self, cursor, recording_id):
+        """Refresh blank_count / has_abnormal_blanks of a recording (single scan of its blanks)"""
+        if _HAS_UPDATE_FROM:
+            cursor.execute(_UPD_BLANK_COUNTS, (recording_id, recording_id))
+        else:
+            count, abnormal = cursor.execute(_SEL_BLANK_COUNTS, (recording_id,)).fetchone()
+            cursor.execute(_SET_BLANK_COUNTS, (count, abnormal, recording_id))
+    
+    def count_recordings(self):
+        """Number of recordings in the database"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+    
+    def iter_recordings_for_listing(self, limit=10):
+        """(filename, created_date, file_size) of the newest recordings, as plain tuples"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.row_factory = None
+            rows = cursor.execute(
+                "SELECT filename, created_date, file_size FROM recordings ORDER BY created_date DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        
+        return iter(rows)
+    
+    def get_all_recordings(self, full=False, limit=None, offset=0, before=None):
+        """Get all recordings from database, newest first
+        
+        Args:
+            full: Return every column instead of the listing columns
+            limit: Maximum number of rows (None: all)
+            offset: Rows to skip (with limit)
+            before: Only rows created before this date. Passing the last
+                created_date of a page fetches the next one without OFFSET.
+        
+        Returns:
+            List of sqlite3.Row (mapping access by column name)
+        """
+        return self.search_recordings(full=full, limit=limit, offset=offset, before=before)
+    
+    def search_recordings(self, keyword=None, start_date=None, end_date=None, has_blanks=None,
+                          full=False, limit=None, offset=0, before=None):
+        """Search recordings with filters (rows and paging as in get_all_recordings)"""
+        columns = "*" if full else _LIST_COLUMNS
+        query = f"SELECT {columns} FROM recordings WHERE 1=1"
         params = []
         
-        if keyword:
+        if before:
+            query += " AND created_date < ?"
+            params.append(before)
+        
+        if keyword and self._fts and len(keyword) >= 3:
+            # Trigrams need at least 3 characters, shorter keywords use LIKE
+            query += " AND id IN (SELECT rowid FROM recordings_fts WHERE recordings_fts MATCH ?)"
+            params.append('"' + keyword.replace('"', '""') + '"')
+        elif keyword:
             query += " AND (filename LIKE ? OR notes LIKE ?)"
             params.extend([f"%{keyword}%", f"%{keyword}%"])
         
@@ -198,12 +484,12 @@ class FileManager:
         
         query += " ORDER BY created_date DESC"
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        recordings = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
         
-        conn.close()
-        return recordings
+        with self._lock:
+            return self.conn.execute(query, params).fetchall()
     
     def delete_old_recordings(self, days=None):
         """Delete recordings older than specified days"""
@@ -216,44 +502,53 @@ class FileManager:
         
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        # Get recordings to delete
-        cursor.execute("SELECT * FROM recordings WHERE created_date < ?", (cutoff_date,))
-        old_recordings = cursor.fetchall()
-        
-        deleted_files = []
-        
-        for recording in old_recordings:
-            recording_id, filename, filepath = recording[0], recording[1], recording[2]
-            
-            # Delete physical files
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                    deleted_files.append(filepath)
-                
-                # Delete associated files (transcript, summary, etc.)
-                base_path = os.path.splitext(filepath)[0]
-                for ext in ['_transcript.txt', '_timestamped.txt', '_summary.txt', '_data.json']:
-                    associated_file = base_path + ext
-                    if os.path.exists(associated_file):
-                        os.remove(associated_file)
-                        deleted_files.append(associated_file)
-                
-                # Delete from database
-                cursor.execute("DELETE FROM blanks WHERE recording_id = ?", (recording_id,))
-                cursor.execute("DELETE FROM transcriptions WHERE recording_id = ?", (recording_id,))
-                cursor.execute("DELETE FROM recordings WHERE id = ?", (recording_id,))
-                
+        with self._lock:
+            old_recordings = self.conn.execute(
+                "SELECT id, filename, filepath FROM recordings WHERE created_date < ?", (cutoff_date,)
+            ).fetchall()
+        
+        # Audio file plus associated files (transcript, summary, etc.), kept
+        # only if present: one listing per directory instead of a stat per path
+        candidates = []
+        for recording_id, filename, filepath in old_recordings:
+            base_path = os.path.splitext(filepath)[0]
+            candidates.append(filepath)
+            candidates.extend(base_path + suffix for suffix in _ASSOCIATED_SUFFIXES)
+        
+        listings = {}
+        existing = []
+        for path in candidates:
+            directory, name = os.path.split(path)
+            if directory not in listings:
+                try:
+                    listings[directory] = set(os.listdir(directory or "."))
+                except OSError:
+                    listings[directory] = set()
+            if name in listings[directory]:
+                existing.append(path)
+        
+        if len(existing) > DELETE_POOL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(_safe_unlink, existing))
+        else:
+            results = [_safe_unlink(path) for path in existing]
+        
+        deleted_files = [path for path in results if path is not None]
+        
+        # Drop the rows whose audio file is gone (blanks and transcriptions cascade);
+        # a recording whose file could not be removed stays tracked
+        removed = set(deleted_files)
+        remaining = {path for path in existing if path not in removed and os.path.exists(path)}
+        gone_ids = []
+        for recording_id, filename, filepath in old_recordings:
+            if filepath in remaining:
+                continue
+            gone_ids.append((recording_id,))
+            if filepath in removed:
                 print(f"🗑️ Deleted: {filename}")
-                
-            except Exception as e:
-                print(f"❌ Error deleting {filename}: {e}")
         
-        conn.commit()
-        conn.close()
+        with self._transaction() as cursor:
+            cursor.executemany("DELETE FROM recordings WHERE id = ?", gone_ids)
         
         print(f"\n✅ Deleted {len(deleted_files)} file(s) older than {days} days")
         return deleted_files
@@ -269,16 +564,13 @@ class FileManager:
         total, used, free = shutil.disk_usage(storage_path)
         
         # Get recordings stats
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*), SUM(file_size), SUM(duration) FROM recordings")
-        count, total_size, total_duration = cursor.fetchone()
-        
-        cursor.execute("SELECT COUNT(*) FROM recordings WHERE has_abnormal_blanks = 1")
-        abnormal_count = cursor.fetchone()[0]
-        
-        conn.close()
+        # (one scan; has_abnormal_blanks is 0/1 so its sum is the count)
+        with self._lock:
+            count, total_size, total_duration, abnormal_count = self.conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(file_size), 0), COALESCE(SUM(duration), 0),
+                       COALESCE(SUM(has_abnormal_blanks), 0)
+                FROM recordings
+            """).fetchone()
         
         return {
             "storage_path": storage_path,
@@ -286,25 +578,38 @@ class FileManager:
             "disk_used_gb": used / (1024**3),
             "disk_free_gb": free / (1024**3),
             "disk_usage_percent": (used / total) * 100,
-            "total_recordings": count or 0,
-            "total_size_mb": (total_size or 0) / (1024**2),
-            "total_duration_hours": (total_duration or 0) / 3600,
-            "recordings_with_issues": abnormal_count or 0
+            "total_recordings": count,
+            "total_size_mb": total_size / (1024**2),
+            "total_duration_hours": total_duration / 3600,
+            "recordings_with_issues": abnormal_count
         }
     
     def export_report(self, output_file="report.json"):
-        """Export comprehensive report"""
-        recordings = self.get_all_recordings()
+        """Export comprehensive report
+        
+        Recordings are streamed from the cursor to the file one row at a
+        time, so the report never sits in memory as a whole.
+        """
         stats = self.get_storage_stats()
         
-        report = {
+        # Header in the json.dump(indent=2) layout, then one recording per line
+        header = json.dumps({
             "generated_date": datetime.now().isoformat(),
-            "statistics": stats,
-            "recordings": recordings
-        }
+            "statistics": stats
+        }, indent=2, ensure_ascii=False)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(header[:-2] + ',\n  "recordings": [')
+            
+            with self._lock:
+                cursor = self.conn.execute("SELECT * FROM recordings ORDER BY created_date DESC")
+                separator = "\n    "
+                for row in cursor:
+                    f.write(separator)
+                    f.write(json.dumps(dict(row), ensure_ascii=False))
+                    separator = ",\n    "
+            
+            f.write("\n  ]\n}" if separator == ",\n    " else "]\n}")
         
         print(f"✅ Report exported: {output_file}")
         return output_file
@@ -316,25 +621,21 @@ class FileManager:
         if not os.path.exists(storage_path):
             return []
         
-        # Get all files in database
-        conn = sqlite3.connect(self.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT filepath FROM recordings")
-        db_files = set(row[0] for row in cursor.fetchall())
-        conn.close()
+        # Get all audio files in storage (single walk, streamed)
+        actual_files = ((path,) for path in _iter_audio_files(storage_path))
         
-        # Get all audio files in storage
-        audio_extensions = ['.wav', '.mp3', '.flac', '.ogg', '.m4a']
-        actual_files = []
-        
-        for ext in audio_extensions:
-            actual_files.extend(Path(storage_path).rglob(f"*{ext}"))
-        
-        # Find orphaned files
-        orphaned = []
-        for file_path in actual_files:
-            if str(file_path) not in db_files:
-                orphaned.append(str(file_path))
+        # Find orphaned files: the paths go into a temp table and the
+        # difference with recordings is computed by SQLite
+        with self._transaction() as cursor:
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS tmp_disk (path TEXT PRIMARY KEY)")
+            cursor.executemany("INSERT OR IGNORE INTO tmp_disk VALUES (?)", actual_files)
+            cursor.execute("""
+                SELECT tmp_disk.path FROM tmp_disk
+                LEFT JOIN recordings ON recordings.filepath = tmp_disk.path
+                WHERE recordings.id IS NULL
+            """)
+            orphaned = [row[0] for row in cursor]
+            cursor.execute("DROP TABLE tmp_disk")
         
         # Delete orphaned files
         for filepath in orphaned:
@@ -355,18 +656,17 @@ if __name__ == "__main__":
     print("📁 FILE MANAGER")
     print("=" * 80)
     
-    manager = FileManager()
+    manager = FileManager(verbose=True)
     
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
         if command == "list":
-            recordings = manager.get_all_recordings()
-            print(f"\n📂 Total recordings: {len(recordings)}\n")
-            for rec in recordings[:10]:  # Show first 10
-                print(f"  • {rec['filename']}")
-                print(f"    Created: {rec['created_date']}")
-                print(f"    Size: {rec['file_size'] / 1024:.1f} KB")
+            print(f"\n📂 Total recordings: {manager.count_recordings()}\n")
+            for filename, created_date, file_size in manager.iter_recordings_for_listing(10):  # Show first 10
+                print(f"  • {filename}")
+                print(f"    Created: {created_date}")
+                print(f"    Size: {file_size / 1024:.1f} KB")
                 print()
         
         elif command == "stats":
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The application modules import each other as top-level packages
+# (audio.processor, ai.blank_classifier, ...), as when run from src/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from ai.blank_classifier import BlankClassifier, _forest_predict_proba, _pack_forest
+
+
+def _fitted_classifier(tmp_path):
+    """Scaler + forest trained like train_model, on features of very different scales"""
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((400, 6)) * [1e-3, 0.5, 10, 200, 1, 5e3] + [0, 1, -20, 1e3, 0, 8e3]
+    y = (X[:, 0] * 1e3 + X[:, 2] / 10 + rng.standard_normal(400) > -2).astype(int)
+    
+    # The last 100 rows are held out, so predictions also cover unseen points
+    scaler = StandardScaler().fit(X[:300])
+    model = RandomForestClassifier(n_estimators=20, max_features='sqrt', random_state=42)
+    model.fit(scaler.transform(X[:300]), y[:300])
+    
+    classifier = BlankClassifier(model_file=str(tmp_path / "missing.pkl"))
+    classifier.model = model
+    classifier.scaler = scaler
+    return classifier, X
+
+
+def test_folded_scaler_matches_scaled_predictions(tmp_path):
+    classifier, X = _fitted_classifier(tmp_path)
+    expected = classifier.model.predict_proba(classifier.scaler.transform(X))
+    
+    classifier._fold_scaler_into_model()
+    
+    assert classifier.scaler is None
+    np.testing.assert_allclose(classifier.model.predict_proba(X), expected)
+
+
+def test_packed_forest_matches_sklearn(tmp_path):
+    classifier, X = _fitted_classifier(tmp_path)
+    expected = classifier.model.predict_proba(classifier.scaler.transform(X))
+    
+    classifier._fold_scaler_into_model()
+    classifier.forest = _pack_forest(classifier.model)
+    
+    proba = _forest_predict_proba(np.ascontiguousarray(X, dtype=np.float32), *classifier.forest)
+    np.testing.assert_allclose(proba, expected, atol=1e-12)
+    
+    labels, confidences = classifier._predict_batch(X)
+    best = classifier.model.classes_[np.argmax(expected, axis=1)]
+    np.testing.assert_array_equal(labels, np.where(best == 1, "natural", "abnormal"))
+    np.testing.assert_allclose(confidences, expected.max(axis=1), atol=1e-12)
+
+
+def test_blank_context_falls_back_to_librosa(tmp_path, monkeypatch):
+    sf = pytest.importorskip("soundfile")
+    from ai import blank_classifier
+    
+    path = str(tmp_path / "stereo.wav")
+    y = 0.1 * np.random.default_rng(0).standard_normal((4 * 22050, 2))
+    sf.write(path, y.astype(np.float32), 22050)
+    classifier = BlankClassifier(model_file=str(tmp_path / "missing.pkl"))
+    expected = classifier._load_blank_context(path, 1.5, 2.0)
+    
+    # Formats libsndfile can't open (m4a) raise a RuntimeError subclass
+    def unreadable(*args, **kwargs):
+        raise sf.LibsndfileError(0, "unsupported format")
+    monkeypatch.setattr(blank_classifier, "sf", SimpleNamespace(SoundFile=unreadable))
+    
+    fallback = classifier._load_blank_context(path, 1.5, 2.0)
+    
+    assert fallback[3] == expected[3]
+    for got, want in zip(fallback[:3], expected[:3]):
+        np.testing.assert_allclose(got, want, atol=1e-4)
@@ -0,0 +1,33 @@
+import json
+import os
+
+from storage.file_manager import FileManager
+
+
+def test_delete_old_recordings_keeps_rows_of_files_it_could_not_remove(tmp_path, monkeypatch):
+    config_file = str(tmp_path / "settings.json")
+    with open(config_file, "w") as f:
+        json.dump({"storage": {"path": str(tmp_path), "auto_delete": True, "lifetime_days": 30}}, f)
+    manager = FileManager(config_file=config_file, db_file=str(tmp_path / "db" / "recordings.db"))
+    
+    paths = {}
+    for name in ("removed", "locked", "missing"):
+        paths[name] = str(tmp_path / f"{name}.wav")
+        with open(paths[name], "wb") as f:
+            f.write(b"RIFF")
+        manager.add_recording(paths[name])
+    os.remove(paths["missing"])
+    manager.conn.execute("UPDATE recordings SET created_date = '2000-01-01T00:00:00'")
+    
+    remove = os.remove
+    def failing_remove(path):
+        if path == paths["locked"]:
+            raise PermissionError(path)
+        remove(path)
+    monkeypatch.setattr(os, "remove", failing_remove)
+    
+    deleted = manager.delete_old_recordings(days=1)
+    
+    assert deleted == [paths["removed"]]
+    rows = manager.conn.execute("SELECT filepath FROM recordings").fetchall()
+    assert [row[0] for row in rows] == [paths["locked"]]
@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+librosa = pytest.importorskip("librosa")
+sf = pytest.importorskip("soundfile")
+
+from audio.processor import _compress_np, _measure_quality, _nonsilent_bounds, _spectral_subtract
+
+
+def _write(tmp_path, y, sr=22050):
+    path = str(tmp_path / "signal.wav")
+    sf.write(path, y, sr, subtype='FLOAT')
+    return path
+
+
+@pytest.mark.parametrize("peak", [1e-3, 1e-5, 0.5])
+def test_dynamic_range_matches_amplitude_to_db(tmp_path, peak):
+    # Quiet tone with exact digital silence around it
+    sr = 22050
+    t = np.arange(sr) / sr
+    y = np.concatenate([np.zeros(sr // 2), peak * np.sin(2 * np.pi * 440 * t), np.zeros(sr // 2)]).astype(np.float32)
+    path = _write(tmp_path, y, sr)
+    
+    db = librosa.amplitude_to_db(np.abs(y), ref=np.max)
+    metrics = _measure_quality.func(path, 0)
+    
+    assert metrics["dynamic_range_db"] == pytest.approx(float(np.max(db) - np.min(db)), abs=1e-4)
+
+
+def test_noise_floor_matches_percentile(tmp_path):
+    rng = np.random.default_rng(0)
+    y = (0.3 * rng.standard_normal(10001)).astype(np.float32)
+    path = _write(tmp_path, y)
+    
+    abs_y = np.abs(y)
+    expected = 20 * np.log10(np.max(abs_y) / np.percentile(abs_y, 10))
+    
+    assert _measure_quality.func(path, 0)["estimated_snr_db"] == pytest.approx(expected, rel=1e-6)
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_compress_matches_pydub(channels):
+    effects = pytest.importorskip("pydub.effects")
+    from pydub import AudioSegment
+    
+    # Loud half above the -20 dBFS threshold, quiet half below it
+    sr = 8000
+    t = np.arange(sr // 2) / sr
+    env = np.where(t < 0.25, 0.8, 0.05)
+    y = np.stack([env * np.sin(2 * np.pi * (300 + 100 * c) * t) for c in range(channels)])
+    pcm = (y * 32767).astype(np.int16)
+    
+    seg = AudioSegment(data=pcm.T.tobytes(), sample_width=2, frame_rate=sr, channels=channels)
+    expected = np.frombuffer(effects.compress_dynamic_range(seg).raw_data, dtype=np.int16)
+    expected = expected.reshape(-1, channels).T
+    
+    samples = pcm.astype(np.float32) / 32768
+    out = _compress_np(samples[0] if channels == 1 else samples, sr) * 32768
+    
+    # pydub works on integer samples (audioop rms, truncating gain)
+    np.testing.assert_allclose(out.reshape(channels, -1), expected, atol=3)
+
+
+def test_spectral_subtract_matches_reference():
+    rng = np.random.default_rng(1)
+    sr = 8000
+    t = np.arange(2 * sr) / sr
+    noise = 0.01 * rng.standard_normal(t.size)
+    y = (noise + np.where(t >= 0.5, 0.3 * np.sin(2 * np.pi * 440 * t), 0)).astype(np.float32)
+    
+    # Bin by bin: mean noise magnitude over the first 0.5 s, gain floored at 0.1
+    S = librosa.stft(y, n_fft=1024, hop_length=256)
+    noise_frames = int(0.5 * sr / 256)
+    gain = np.empty(S.shape)
+    for k in range(S.shape[0]):
+        noise_mag = np.mean(np.abs(S[k, :noise_frames]))
+        gain[k] = np.maximum(1 - (noise_mag / (np.abs(S[k]) + 1e-9)) ** 2, 0.1)
+    expected = librosa.istft(S * gain, hop_length=256, length=len(y))
+    
+    out = _spectral_subtract(y, sr)
+    
+    np.testing.assert_allclose(out, expected, atol=1e-5)
+    # The noise-only lead-in comes out attenuated
+    assert np.std(out[:sr // 2]) < 0.6 * np.std(y[:sr // 2])
+
+
+@pytest.mark.parametrize("n_ms", [1000, 1003])
+def test_nonsilent_bounds_matches_pydub(n_ms):
+    silence = pytest.importorskip("pydub.silence")
+    from pydub import AudioSegment
+    
+    sr = 8000
+    n = n_ms * sr // 1000
+    t = np.arange(n) / sr
+    y = np.where((t >= 0.2) & (t < 0.7), 0.5 * np.sin(2 * np.pi * 440 * t), 0.0)
+    pcm = (y * 32767).astype(np.int16)
+    audio = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sr, channels=1)
+    
+    # Baseline trim_silence: leading silence of the audio and of its reverse
+    start_ms = silence.detect_leading_silence(audio, silence_threshold=-40)
+    end_ms = len(audio) - silence.detect_leading_silence(audio.reverse(), silence_threshold=-40)
+    
+    start, end = _nonsilent_bounds(pcm.astype(np.float32) / 32768, sr, -40)
+    
+    assert start == start_ms * sr // 1000
+    # The reversed scan frames the tail from the end, so it may land up to one frame off
+    frame = sr // 100
+    if n % frame == 0:
+        assert end == end_ms * sr // 1000
+    else:
+        assert abs(end - end_ms * sr // 1000) < frame
@@ -0,0 +1,29 @@
+import json
+import os
+
+from settings import load_settings
+
+
+def test_load_settings_returns_independent_copies(tmp_path):
+    path = str(tmp_path / "settings.json")
+    with open(path, "w") as f:
+        json.dump({"audio": {"silence_threshold": -40}}, f)
+    
+    config = load_settings(path)
+    config["audio"]["silence_threshold"] = 0
+    
+    assert load_settings(path) == {"audio": {"silence_threshold": -40}}
+
+
+def test_load_settings_reads_a_rewritten_file(tmp_path):
+    path = str(tmp_path / "settings.json")
+    with open(path, "w") as f:
+        json.dump({"ai": {"whisper_model": "base"}}, f)
+    assert load_settings(path)["ai"]["whisper_model"] == "base"
+    
+    with open(path, "w") as f:
+        json.dump({"ai": {"whisper_model": "large"}}, f)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    
+    assert load_settings(path)["ai"]["whisper_model"] == "large"
@@ -0,0 +1,115 @@
+import json
+
+import numpy as np
+import pytest
+
+librosa = pytest.importorskip("librosa")
+
+from audio.silence_detector import (
+    SilenceDetector, _amplitude_to_db, _detect_nonsilent_np, _detect_silence_np, _frame_rms,
+    _stream_silences
+)
+
+
+def _quiet_signal(peak, sr=22050):
+    """Tone at the given peak between stretches of exact digital silence"""
+    t = np.arange(sr) / sr
+    return np.concatenate([np.zeros(sr), peak * np.sin(2 * np.pi * 220 * t), np.zeros(sr)]).astype(np.float32)
+
+
+def _speech_like_pcm(sr, channels):
+    """int16 bursts of tone separated by quiet hiss and exact silence"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for ms, level in [(300, 0.5), (400, 0.001), (250, 0.3), (120, 0.0), (600, 0.4), (700, 0.0), (200, 0.2)]:
+        n = ms * sr // 1000
+        t = np.arange(n) / sr
+        tone = np.sin(2 * np.pi * 330 * t) if level > 0.01 else rng.standard_normal(n)
+        parts.append(level * tone)
+    y = np.concatenate(parts)
+    return (np.stack([y * (1 - 0.3 * c) for c in range(channels)], axis=1) * 32767).astype(np.int16)
+
+
+def test_frame_rms_matches_librosa():
+    y = _quiet_signal(0.4)
+    np.testing.assert_allclose(_frame_rms(y), librosa.feature.rms(y=y)[0], rtol=1e-5, atol=1e-8)
+
+
+@pytest.mark.parametrize("peak", [0.5, 1e-3, 2e-5, 1e-6])
+def test_amplitude_to_db_matches_librosa(peak):
+    rms = librosa.feature.rms(y=_quiet_signal(peak))[0]
+    np.testing.assert_allclose(_amplitude_to_db(rms), librosa.amplitude_to_db(rms, ref=np.max), atol=1e-4)
+
+
+@pytest.mark.parametrize("threshold", [-40.0, -60.0, -80.0, -90.0])
+@pytest.mark.parametrize("peak", [0.5, 1e-3, 1e-6])
+def test_silence_ratio_matches_db_comparison(tmp_path, threshold, peak):
+    config_file = tmp_path / "settings.json"
+    config_file.write_text(json.dumps({"audio": {"silence_threshold": threshold, "min_silence_duration": 3}}))
+    detector = SilenceDetector(str(config_file))
+    
+    rng = np.random.default_rng(1)
+    y = _quiet_signal(peak) + (peak * 1e-3 * rng.standard_normal(3 * 22050)).astype(np.float32)
+    rms = librosa.feature.rms(y=y)[0]
+    db = librosa.amplitude_to_db(rms, ref=np.max)
+    expected = np.sum(db < threshold) / len(db)
+    
+    assert detector._calculate_silence_ratio(rms) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("sr, channels, seek_step", [(8000, 1, 1), (11025, 2, 1), (11025, 1, 7)])
+def test_detect_silence_matches_pydub(sr, channels, seek_step):
+    pydub_silence = pytest.importorskip("pydub.silence")
+    from pydub import AudioSegment
+    
+    pcm = _speech_like_pcm(sr, channels)
+    audio = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sr, channels=channels)
+    
+    silent = _detect_silence_np(pcm.ravel(), channels, sr, 100, -40, seek_step)
+    
+    assert silent == pydub_silence.detect_silence(audio, 100, -40, seek_step)
+    assert _detect_nonsilent_np(silent, len(audio)) == pydub_silence.detect_nonsilent(audio, 100, -40, seek_step)
+
+
+@pytest.mark.parametrize("seek_step, block_ms", [(1, 1000), (1, 150), (7, 90)])
+def test_stream_silences_matches_pydub(tmp_path, seek_step, block_ms):
+    sf = pytest.importorskip("soundfile")
+    pydub_silence = pytest.importorskip("pydub.silence")
+    from pydub import AudioSegment
+    
+    sr, channels = 11025, 2
+    pcm = _speech_like_pcm(sr, channels)
+    path = str(tmp_path / "speech.wav")
+    sf.write(path, pcm, sr, subtype='PCM_16')
+    audio = AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=sr, channels=channels)
+    
+    # Small blocks make windows and ranges span several reads
+    streamed = list(_stream_silences(path, 100, -40, seek_step, block_ms))
+    
+    assert streamed == pydub_silence.detect_silence(audio, 100, -40, seek_step)
+
+
+def test_batch_report_decodes_each_file_once(tmp_path, monkeypatch):
+    sf = pytest.importorskip("soundfile")
+    from audio import silence_detector
+    
+    sr = 22050
+    y = np.zeros(8 * sr, dtype=np.float32)
+    y[2 * sr:3 * sr] = 0.3
+    y[6 * sr:] = 0.3
+    files = []
+    for i in range(4):
+        files.append(str(tmp_path / f"{i}.wav"))
+        sf.write(files[-1], y, sr)
+    
+    reads = []
+    read = silence_detector.sf.read
+    def counting_read(path, *args, **kwargs):
+        reads.append(path)
+        return read(path, *args, **kwargs)
+    monkeypatch.setattr(silence_detector.sf, "read", counting_read)
+    
+    reports = SilenceDetector.batch_report(files, workers=4, config_file=str(tmp_path / "none.json"))
+    
+    assert all(reports.values())
+    assert sorted(reads) == files